@@ -1,10 +1,23 @@
 #!/usr/bin/env python3
-from typing import Optional, Tuple
+import heapq
+import itertools
+import os
+import tempfile
+import time
+import tracemalloc
+import weakref
+from array import array
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
 
 class ListNode:
     """
     Вузол однозв'язного списку.
+    __slots__ прибирає __dict__ з кожного екземпляра (≈56 байт замість ≈150).
     """
+    __slots__ = ('val', 'next')
+
     def __init__(self, val: int, next: 'ListNode' = None):
         self.val = val
         self.next = next
@@ -28,6 +41,33 @@ def reverse_list(head: Optional[ListNode]) -> Optional[ListNode]:
     return prev
 
 
+def _gallop_into(tail: ListNode, l1: Optional[ListNode],
+                 l2: Optional[ListNode]) -> ListNode:
+    """
+    Зливає l1 та l2 після вузла tail з «галопом»: коли голова одного списку
+    менша за голову іншого, одразу проходимо весь відрізок таких вузлів і
+    приєднуємо його одним посиланням. Для впорядкованих даних це зводить
+    злиття до одного проходу без переписування next у кожному вузлі.
+    Повертає вузол, після якого приєднано залишок. При рівних значеннях
+    першим іде вузол з l1 (стабільність).
+    """
+    while l1 and l2:
+        if l1.val <= l2.val:
+            tail.next = l1
+            pivot = l2.val
+            while l1.next and l1.next.val <= pivot:
+                l1 = l1.next
+            tail, l1 = l1, l1.next
+        else:
+            tail.next = l2
+            pivot = l1.val
+            while l2.next and l2.next.val < pivot:
+                l2 = l2.next
+            tail, l2 = l2, l2.next
+    tail.next = l1 or l2
+    return tail
+
+
 def merge_two_sorted(l1: Optional[ListNode],
                      l2: Optional[ListNode]) -> Optional[ListNode]:
     """
@@ -35,40 +75,389 @@ def merge_two_sorted(l1: Optional[ListNode],
     Повертає голову нового списку.
     """
     dummy = ListNode(0)
+    _gallop_into(dummy, l1, l2)
+    return dummy.next
+
+
+def merge_k_sorted(lists: list) -> Optional[ListNode]:
+    """
+    Об'єднує k відсортованих однозв'язних списків в один за O(N log k)
+    за допомогою мін-кучі з поточних голів списків.
+    При рівних значеннях першим іде вузол зі списку з меншим індексом
+    (як `<=` у merge_two_sorted, що віддає перевагу лівому списку).
+    """
+    heap = [(node.val, i, node) for i, node in enumerate(lists) if node]
+    heapq.heapify(heap)
+    dummy = ListNode(0)
     tail = dummy
-    while l1 and l2:
-        if l1.val <= l2.val:
-            tail.next, l1 = l1, l1.next
+    while heap:
+        _, i, node = heap[0]
+        tail.next = node
+        tail = node
+        if node.next:
+            heapq.heapreplace(heap, (node.next.val, i, node.next))
         else:
-            tail.next, l2 = l2, l2.next
-        tail = tail.next
-    tail.next = l1 or l2
+            heapq.heappop(heap)
+    tail.next = None
     return dummy.next
 
 
+def iter_list(head: Optional[ListNode]) -> Iterator[int]:
+    """Лінивий ітератор значень однозв'язного списку."""
+    while head:
+        yield head.val
+        head = head.next
+
+
+def merge_sorted_iters(iterables) -> Iterator[int]:
+    """
+    Потокове k-шляхове злиття відсортованих ітерабельних джерел (списки,
+    iter_list(...), генератори, що читають серії з диска). Значення
+    видаються по одному; у пам'яті тримається лише по одному елементу
+    з кожного джерела. Стабільне: при рівності першим іде ліве джерело.
+    """
+    return heapq.merge(*iterables)
+
+
+def _split(head: Optional[ListNode], size: int) -> Optional[ListNode]:
+    """
+    Відрізає від head перші size вузлів і повертає голову решти списку.
+    """
+    for _ in range(size - 1):
+        if head is None:
+            return None
+        head = head.next
+    if head is None:
+        return None
+    rest = head.next
+    head.next = None
+    return rest
+
+
+def _merge_into(tail: ListNode, l1: Optional[ListNode],
+                l2: Optional[ListNode]) -> ListNode:
+    """
+    Зливає l1 та l2 після вузла tail і повертає останній вузол результату.
+    При рівних значеннях першим іде вузол з l1 (стабільність).
+    """
+    tail = _gallop_into(tail, l1, l2)
+    while tail.next:
+        tail = tail.next
+    return tail
+
+
 def sort_list(head: Optional[ListNode]) -> Optional[ListNode]:
     """
     Сортує однозв'язний список методом злиття (Merge Sort).
     Повертає голову відсортованого списку.
+    Ітеративний варіант «знизу вгору»: на кожному проході зливаються сусідні
+    серії довжини width = 1, 2, 4, ...; без рекурсії та з O(1) додаткової пам'яті.
     """
-    if not head or not head.next:
+    length = 0
+    curr = head
+    while curr:
+        length += 1
+        curr = curr.next
+    if length < 2:
         return head
 
-    # Знаходимо середину списку
-    slow, fast = head, head.next
-    while fast and fast.next:
-        slow = slow.next
-        fast = fast.next.next
+    dummy = ListNode(0, head)
+    width = 1
+    while width < length:
+        tail, curr = dummy, dummy.next
+        while curr:
+            left = curr
+            right = _split(left, width)
+            curr = _split(right, width)
+            tail = _merge_into(tail, left, right)
+        width *= 2
+    return dummy.next
+
+
+def _next_run(head: ListNode):
+    """
+    Відокремлює від head найдовшу природну серію: неспадну або строго
+    спадну (останню розвертаємо; строгість зберігає стабільність).
+    Повертає (run_head, run_tail, length, rest).
+    """
+    start, length = head, 1
+    if head.next and head.next.val < head.val:
+        while head.next and head.next.val < head.val:
+            head = head.next
+            length += 1
+        rest, head.next = head.next, None
+        return reverse_list(start), start, length, rest
+    while head.next and head.next.val >= head.val:
+        head = head.next
+        length += 1
+    rest, head.next = head.next, None
+    return start, head, length, rest
+
+
+def _merge_at(stack: list, i: int):
+    """Зливає серії stack[i] та stack[i + 1] (ліва має перевагу при рівності)."""
+    h1, t1, n1 = stack[i]
+    h2, t2, n2 = stack[i + 1]
+    dummy = ListNode(0)
+    _gallop_into(dummy, h1, h2)
+    # Останнім іде хвіст другої серії, якщо він не менший за хвіст першої
+    tail = t2 if t2.val >= t1.val else t1
+    stack[i] = [dummy.next, tail, n1 + n2]
+    del stack[i + 1]
+
+
+def sort_list_adaptive(head: Optional[ListNode]) -> Optional[ListNode]:
+    """
+    Адаптивне (природне) сортування злиттям у стилі TimSort.
+    Один прохід ділить список на природні серії (спадні розвертаються),
+    серії кладуться на стек і зливаються за інваріантами TimSort
+    (|Z| > |Y| + |X|, |Y| > |X|), а злиття використовує галоп.
+    Відсортований чи майже відсортований список обробляється за ≈O(n).
+    """
+    stack = []
+    while head:
+        run_head, run_tail, length, head = _next_run(head)
+        stack.append([run_head, run_tail, length])
+        while len(stack) > 1:
+            n = len(stack) - 2
+            if ((n > 0 and stack[n - 1][2] <= stack[n][2] + stack[n + 1][2]) or
+                    (n > 1 and stack[n - 2][2] <= stack[n - 1][2] + stack[n][2])):
+                if stack[n - 1][2] < stack[n + 1][2]:
+                    n -= 1
+            elif stack[n][2] > stack[n + 1][2]:
+                break
+            _merge_at(stack, n)
+    while len(stack) > 1:
+        _merge_at(stack, len(stack) - 2)
+    return stack[0][0] if stack else None
+
+
+class ArrayLinkedList:
+    """
+    Пул вузлів однозв'язних списків на паралельних масивах array('q'):
+    vals[i] — значення вузла i, nxt[i] — індекс наступного вузла або -1.
+    Список задається індексом голови (-1 — порожній). Методи повторюють
+    API модуля (reverse_list, merge_two_sorted, sort_list), але працюють
+    з індексами замість об'єктів: 16 байт на вузол.
+    Вузол 0 — службовий (аналог dummy у функціях для ListNode).
+    """
+    DUMMY = 0
+
+    def __init__(self):
+        self.vals = array('q', [0])
+        self.nxt = array('q', [-1])
 
-    mid = slow.next
-    slow.next = None  # Розриваємо список на дві частини
+    def build_list(self, values) -> int:
+        """Додає вузли зі значеннями values у пул і повертає голову списку."""
+        start = len(self.vals)
+        self.vals.extend(values)
+        end = len(self.vals)
+        if end == start:
+            return -1
+        self.nxt.extend(range(start + 1, end))
+        self.nxt.append(-1)
+        return start
 
-    # Рекурсивно сортуємо обидві половини
-    left = sort_list(head)
-    right = sort_list(mid)
+    def list_to_py(self, head: int) -> list[int]:
+        vals, nxt = self.vals, self.nxt
+        out = []
+        while head >= 0:
+            out.append(vals[head])
+            head = nxt[head]
+        return out
 
-    # Зливаємо відсортовані половини
-    return merge_two_sorted(left, right)
+    def reverse_list(self, head: int) -> int:
+        nxt = self.nxt
+        prev = -1
+        while head >= 0:
+            following = nxt[head]
+            nxt[head] = prev
+            prev = head
+            head = following
+        return prev
+
+    def _split(self, head: int, size: int) -> int:
+        nxt = self.nxt
+        for _ in range(size - 1):
+            if head < 0:
+                return -1
+            head = nxt[head]
+        if head < 0:
+            return -1
+        rest = nxt[head]
+        nxt[head] = -1
+        return rest
+
+    def _merge_into(self, tail: int, l1: int, l2: int) -> int:
+        vals, nxt = self.vals, self.nxt
+        while l1 >= 0 and l2 >= 0:
+            if vals[l1] <= vals[l2]:
+                nxt[tail], l1 = l1, nxt[l1]
+            else:
+                nxt[tail], l2 = l2, nxt[l2]
+            tail = nxt[tail]
+        nxt[tail] = l1 if l1 >= 0 else l2
+        while nxt[tail] >= 0:
+            tail = nxt[tail]
+        return tail
+
+    def merge_two_sorted(self, l1: int, l2: int) -> int:
+        self._merge_into(self.DUMMY, l1, l2)
+        return self.nxt[self.DUMMY]
+
+    def sort_list(self, head: int) -> int:
+        """Ітеративне злиття «знизу вгору», як sort_list для ListNode."""
+        nxt = self.nxt
+        length = 0
+        curr = head
+        while curr >= 0:
+            length += 1
+            curr = nxt[curr]
+
+        dummy = self.DUMMY
+        nxt[dummy] = head
+        width = 1
+        while width < length:
+            tail, curr = dummy, nxt[dummy]
+            while curr >= 0:
+                left = curr
+                right = self._split(left, width)
+                curr = self._split(right, width)
+                tail = self._merge_into(tail, left, right)
+            width *= 2
+        return nxt[dummy]
+
+
+# Бюджет пам'яті зовнішнього сортування за замовчуванням (байт)
+EXTERNAL_MEMORY = 64 * 2**20
+
+
+def _write_runs(source, run_len: int, tmpdir: str) -> list[str]:
+    """
+    Фаза 1 зовнішнього сортування: читає source серіями по run_len значень,
+    сортує кожну в пам'яті (np.sort) і скидає у тимчасовий файл int64.
+    source — шлях до бінарного файлу int64 (читається через np.memmap)
+    або будь-який ітерабельний об'єкт цілих чисел.
+    """
+    runs = []
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.getsize(source):
+            return runs  # порожній файл не можна відобразити через np.memmap
+        data = np.memmap(source, dtype=np.int64, mode='r')
+        chunks = (np.array(data[i:i + run_len]) for i in range(0, len(data), run_len))
+    else:
+        it = iter(source)
+        chunks = (np.fromiter(itertools.islice(it, run_len), dtype=np.int64)
+                  for _ in itertools.count())
+    for chunk in chunks:
+        if not len(chunk):
+            break
+        chunk.sort()
+        path = os.path.join(tmpdir, f'run{len(runs):05d}.bin')
+        chunk.tofile(path)
+        runs.append(path)
+    return runs
+
+
+def _merge_runs(runs: list[str], out, block_len: int):
+    """
+    Фаза 2: k-шляхове злиття серій блоками. З кожної серії (np.memmap)
+    у буфер читається block_len значень; усі значення, не більші за
+    найменший «останній елемент» серед буферів, гарантовано можна видати,
+    тож вони зливаються одним np.sort і записуються у out.
+    """
+    maps = [np.memmap(path, dtype=np.int64, mode='r') for path in runs]
+    pos = [0] * len(maps)
+    bufs = []
+    for i, m in enumerate(maps):
+        bufs.append(np.array(m[:block_len]))
+        pos[i] = len(bufs[i])
+    while True:
+        live = [i for i, b in enumerate(bufs) if len(b)]
+        if not live:
+            break
+        # Серія, чий буфер вичерпається першим, задає безпечну межу
+        bound = min(bufs[i][-1] if pos[i] < len(maps[i]) else np.iinfo(np.int64).max
+                    for i in live)
+        parts = []
+        for i in live:
+            cut = np.searchsorted(bufs[i], bound, side='right')
+            parts.append(bufs[i][:cut])
+            rest = bufs[i][cut:]
+            if not len(rest) and pos[i] < len(maps[i]):
+                rest = np.array(maps[i][pos[i]:pos[i] + block_len])
+                pos[i] += len(rest)
+            bufs[i] = rest
+        merged = np.concatenate(parts)
+        merged.sort(kind='stable')
+        merged.tofile(out)
+
+
+def external_sort(source, output: str = None, memory_budget: int = EXTERNAL_MEMORY,
+                  tmpdir: str = None):
+    """
+    Зовнішнє (out-of-core) сортування цілих int64, що не вміщаються в пам'ять.
+    source — шлях до бінарного файлу int64 або ітерабельне джерело значень
+    (наприклад, iter_list(head) чи генератор). Серії розміром memory_budget/16
+    значень сортуються в пам'яті, скидаються у тимчасові файли і зливаються
+    блоками через np.memmap.
+
+    Якщо задано output, результат записується у цей файл і повертається шлях;
+    інакше повертається лінивий ітератор відсортованих значень (його можна
+    передати в build_list або споживати потоково). Тимчасовий файл за ним
+    видаляється, коли ітератор вичерпано, закрито (close()) або зібрано
+    збирачем сміття — навіть якщо ітерацію так і не почали.
+    """
+    run_len = max(1, memory_budget // 16)
+    with tempfile.TemporaryDirectory(dir=tmpdir) as tmp:
+        runs = _write_runs(source, run_len, tmp)
+        target = output or os.path.join(tmp, 'sorted.bin')
+        with open(target, 'wb') as out:
+            if len(runs) == 1:
+                np.fromfile(runs[0], dtype=np.int64).tofile(out)
+            elif runs:
+                block_len = max(1, memory_budget // (16 * (len(runs) + 1)))
+                _merge_runs(runs, out, block_len)
+        if output:
+            return output
+        # Переносимо результат з тимчасової теки, щоб ітератор пережив її
+        fd, keep = tempfile.mkstemp(suffix='.bin', dir=tmpdir)
+        os.close(fd)
+        os.replace(target, keep)
+    return iter_sorted_file(keep, remove=True)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def iter_sorted_file(path: str, block_len: int = 1 << 16,
+                     remove: bool = False) -> Iterator[int]:
+    """
+    Лінивий ітератор значень бінарного файлу int64 (блоками через np.memmap).
+    При remove=True файл видаляється після вичерпання чи закриття ітератора,
+    а якщо ітерацію не почали — коли ітератор збирає збирач сміття.
+    """
+    it = _iter_file(path, block_len, remove)
+    if remove:
+        # finally у генераторі не виконується, якщо його ні разу не запускали
+        weakref.finalize(it, _remove_quietly, path)
+    return it
+
+
+def _iter_file(path: str, block_len: int, remove: bool) -> Iterator[int]:
+    try:
+        if os.path.getsize(path):
+            data = np.memmap(path, dtype=np.int64, mode='r')
+            for i in range(0, len(data), block_len):
+                yield from data[i:i + block_len].tolist()
+            del data
+    finally:
+        if remove:
+            _remove_quietly(path)
 
 
 # -------------------
@@ -95,7 +484,171 @@ def list_to_py(head: Optional[ListNode]) -> list[int]:
         curr = curr.next
     return out
 
+def _measure(fn, *args):
+    """Повертає (результат, секунди, пікова пам'ять у МБ) для fn(*args)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def benchmark(sizes=(1_000_000,)):
+    """
+    Порівнює ListNode зі __slots__ та ArrayLinkedList: пам'ять на побудову
+    списку (tracemalloc) і час сортування sort_list на випадкових даних.
+    """
+    import random
+    print(f"{'n':>10} {'структура':>16} | {'МБ':>8} {'сорт., с':>9}")
+    for n in sizes:
+        values = [random.randrange(n) for _ in range(n)]
+        expected = sorted(values)
+
+        head, _, mem = _measure(build_list, values)
+        t0 = time.perf_counter()
+        head = sort_list(head)
+        elapsed = time.perf_counter() - t0
+        assert list_to_py(head) == expected
+        print(f"{n:>10} {'ListNode':>16} | {mem:>8.1f} {elapsed:>9.2f}")
+        del head
+
+        pool = ArrayLinkedList()
+        ahead, _, mem = _measure(pool.build_list, values)
+        t0 = time.perf_counter()
+        ahead = pool.sort_list(ahead)
+        elapsed = time.perf_counter() - t0
+        assert pool.list_to_py(ahead) == expected
+        print(f"{n:>10} {'ArrayLinkedList':>16} | {mem:>8.1f} {elapsed:>9.2f}")
+        del pool
+
+def benchmark_merge(k_values=(16, 64, 256), run_length: int = 2_000):
+    """
+    k-шляхове злиття merge_k_sorted та merge_sorted_iters проти послідовного
+    злиття по два (merge_two_sorted), яке квадратичне за кількістю серій.
+    """
+    import random
+    print(f"{'k':>5} {'N':>8} | {'попарно, с':>10} {'k-way, с':>9} {'iter, с':>8}")
+    for k in k_values:
+        runs = [sorted(random.randrange(10**6) for _ in range(run_length)) for _ in range(k)]
+        expected = sorted(v for run in runs for v in run)
+
+        lists = [build_list(run) for run in runs]
+        t0 = time.perf_counter()
+        merged = None
+        for head in lists:
+            merged = merge_two_sorted(merged, head)
+        pair_t = time.perf_counter() - t0
+        assert list_to_py(merged) == expected
+
+        lists = [build_list(run) for run in runs]
+        t0 = time.perf_counter()
+        merged = merge_k_sorted(lists)
+        kway_t = time.perf_counter() - t0
+        assert list_to_py(merged) == expected
+
+        t0 = time.perf_counter()
+        streamed = list(merge_sorted_iters(runs))
+        iter_t = time.perf_counter() - t0
+        assert streamed == expected
+        print(f"{k:>5} {k * run_length:>8} | {pair_t:>10.2f} {kway_t:>9.2f} {iter_t:>8.2f}")
+
+def benchmark_external(n: int = 20_000_000, memory_mb: int = 16):
+    """
+    Перевіряє external_sort проти sort_list на малих входах і вимірює
+    пропускну здатність на бінарному файлі з n випадкових int64 при бюджеті
+    memory_mb МБ (ціль: ≥ 10 млн значень/с на одному ядрі).
+    """
+    import random
+    for size in (0, 1, 7, 1000, 5000):
+        values = [random.randrange(-50, 50) for _ in range(size)]
+        expected = list_to_py(sort_list(build_list(values)))
+        got = list_to_py(build_list(list(external_sort(values, memory_budget=16 * 64))))
+        assert got == expected, size
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'input.bin')
+        dst = os.path.join(tmp, 'sorted.bin')
+        rng = np.random.default_rng(0)
+        rng.integers(-2**62, 2**62, size=n, dtype=np.int64).tofile(src)
+        t0 = time.perf_counter()
+        external_sort(src, dst, memory_budget=memory_mb * 2**20)
+        elapsed = time.perf_counter() - t0
+        result = np.fromfile(dst, dtype=np.int64)
+        assert len(result) == n and np.all(result[:-1] <= result[1:])
+    runs = -(-n // (memory_mb * 2**20 // 16))
+    print(f"{n:,} значень, бюджет {memory_mb} МБ ({runs} серій): {elapsed:.2f} с, "
+          f"{n / elapsed / 1e6:.1f} млн значень/с")
+
+def benchmark_adaptive(n: int = 200_000):
+    """
+    sort_list проти sort_list_adaptive на відсортованих, обернених,
+    випадкових, майже відсортованих даних і даних з кількома унікальними значеннями.
+    """
+    import random
+    base = list(range(n))
+    nearly = base[:]
+    for _ in range(n // 100):
+        i, j = random.randrange(n), random.randrange(n)
+        nearly[i], nearly[j] = nearly[j], nearly[i]
+    inputs = {
+        'sorted': base,
+        'reversed': base[::-1],
+        'random': random.sample(base, n),
+        'nearly sorted': nearly,
+        'few unique': [random.randrange(4) for _ in range(n)],
+    }
+    print(f"{'вхід':>14} | {'sort_list, с':>12} {'adaptive, с':>12}")
+    for name, values in inputs.items():
+        expected = sorted(values)
+        head = build_list(values)
+        t0 = time.perf_counter()
+        head = sort_list(head)
+        plain_t = time.perf_counter() - t0
+        assert list_to_py(head) == expected
+        head = build_list(values)
+        t0 = time.perf_counter()
+        head = sort_list_adaptive(head)
+        adaptive_t = time.perf_counter() - t0
+        assert list_to_py(head) == expected
+        print(f"{name:>14} | {plain_t:>12.3f} {adaptive_t:>12.3f}")
+
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Завдання 1: однозв'язний список")
+    parser.add_argument('--benchmark', type=int, nargs='*', metavar='N',
+                        help="Бенчмарк для розмірів N (за замовчуванням: 1000000)")
+    parser.add_argument('--benchmark-merge', action='store_true',
+                        help="Бенчмарк k-шляхового злиття")
+    parser.add_argument('--benchmark-external', action='store_true',
+                        help="Бенчмарк зовнішнього сортування")
+    parser.add_argument('--external-sort', metavar='INPUT',
+                        help="Зовнішнє сортування бінарного файлу int64")
+    parser.add_argument('--output', '-o', metavar='PATH', default='sorted.bin',
+                        help="Файл результату для --external-sort (за замовчуванням: sorted.bin)")
+    parser.add_argument('--memory-mb', type=int, default=EXTERNAL_MEMORY // 2**20,
+                        help="Бюджет пам'яті зовнішнього сортування, МБ (за замовчуванням: 64)")
+    parser.add_argument('--benchmark-adaptive', action='store_true',
+                        help="Бенчмарк адаптивного сортування на різних входах")
+    args = parser.parse_args()
+    if args.benchmark_adaptive:
+        benchmark_adaptive()
+        raise SystemExit
+    if args.external_sort:
+        external_sort(args.external_sort, args.output, args.memory_mb * 2**20)
+        print(f"Відсортовано {args.external_sort} → {args.output}")
+        raise SystemExit
+    if args.benchmark_external:
+        benchmark_external()
+        raise SystemExit
+    if args.benchmark is not None:
+        benchmark(args.benchmark or (1_000_000,))
+        raise SystemExit
+    if args.benchmark_merge:
+        benchmark_merge()
+        raise SystemExit
+
     # Приклад 1: реверсування списку
     vals = [1, 2, 3, 4, 5]
     head = build_list(vals)
@@ -116,3 +669,8 @@ if __name__ == "__main__":
     b = build_list([2, 3, 5, 7, 9])
     merged = merge_two_sorted(a, b)
     print("\nЗлиття [1,4,6,8] та [2,3,5,7,9]:", list_to_py(merged))
+
+    # Приклад 4: злиття k відсортованих списків
+    runs = [[1, 5, 9], [2, 6], [0, 3, 7, 8], [4]]
+    merged_k = merge_k_sorted([build_list(r) for r in runs])
+    print(f"\nЗлиття {runs}:", list_to_py(merged_k))
@@ -1,50 +1,529 @@
 #!/usr/bin/env python3
 import argparse
+import multiprocessing
+import struct
+import zlib
+from collections import namedtuple
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon
+from matplotlib.collections import PathCollection
+from matplotlib.colors import to_hex, to_rgba
+from matplotlib.path import Path
 
-def draw_pythagoras_tree(ax, x, y, size, angle, depth):
-    if depth == 0:
+# Кут розгалуження дерева
+THETA = np.pi / 4
+
+# Кольори стовбура та листя; рівні між ними інтерполюються
+TRUNK_COLOR = 'saddlebrown'
+LEAF_COLOR = 'lightgreen'
+
+Branching = namedtuple('Branching', ['left_angle', 'right_angle', 'left_ratio', 'right_ratio'])
+Branching.__doc__ = """
+Правило розгалуження: лівий нащадок стоїть на p3 і повернутий на
++left_angle, правий — на p2 і повернутий на -right_angle; їхні розміри —
+розмір батька, помножений на left_ratio і right_ratio.
+"""
+
+
+def make_branching(angle=THETA, right_angle=None, ratio=None):
+    """
+    Будує Branching за кутами в радіанах. Без ratio розміри нащадків —
+    cos(angle) і sin(right_angle), що за 45° дає класичне дерево.
+    ratio — одне число для обох нащадків або пара (лівий, правий).
+    """
+    if right_angle is None:
+        right_angle = angle
+    if ratio is None:
+        ratio = (np.cos(angle), np.sin(right_angle))
+    elif np.ndim(ratio) == 0:
+        ratio = (ratio, ratio)
+    left_ratio, right_ratio = (float(r) for r in ratio)
+    if not (0 < left_ratio < 1 and 0 < right_ratio < 1):
+        raise ValueError("Коефіцієнти зменшення мають лежати в інтервалі (0, 1)")
+    return Branching(float(angle), float(right_angle), left_ratio, right_ratio)
+
+
+DEFAULT_BRANCHING = make_branching()
+
+
+def subtree_reach(branch=DEFAULT_BRANCHING):
+    """
+    Радіус кола навколо p0 квадрата розміру 1, що містить усе його піддерево:
+    R = √2 + r·R, де r — найбільший коефіцієнт зменшення нащадка.
+    """
+    r = max(branch.left_ratio, branch.right_ratio)
+    return np.sqrt(2) / (1 - r)
+
+
+def _square_vertices(xs, ys, sizes, angles):
+    """Вершини p0..p3 квадратів з опорною точкою p0, розміром і кутом: (N, 4, 2)."""
+    dx = sizes * np.cos(angles)
+    dy = sizes * np.sin(angles)
+    p0 = np.stack([xs, ys], axis=-1)
+    p1 = p0 + np.stack([dx, dy], axis=-1)
+    p3 = p0 + np.stack([-dy, dx], axis=-1)
+    p2 = p1 + (p3 - p0)
+    return np.stack([p0, p1, p2, p3], axis=1)
+
+
+def _children(squares, sizes, angles, branch):
+    """Стан (xs, ys, sizes, angles) нащадків: спершу всі ліві, потім усі праві."""
+    p2, p3 = squares[:, 2], squares[:, 3]
+    # Ліві нащадки стоять на p3, праві — на p2
+    return (np.concatenate([p3[:, 0], p2[:, 0]]),
+            np.concatenate([p3[:, 1], p2[:, 1]]),
+            np.concatenate([sizes * branch.left_ratio, sizes * branch.right_ratio]),
+            np.concatenate([angles + branch.left_angle, angles - branch.right_angle]))
+
+
+def pythagoras_levels(x, y, size, angle, depth, min_size=0.0, clip=None,
+                      branch=DEFAULT_BRANCHING):
+    """
+    Генерує квадрати дерева Піфагора рівень за рівнем без рекурсії.
+    Кожен рівень — масив вершин форми (2^k, 4, 2); усі квадрати рівня
+    обчислюються одним векторизованим перетворенням масивів попереднього.
+
+    Квадрати, менші за min_size, видаються, але не розгалужуються далі
+    (зупинка за розміром, а не лише за depth). Якщо задано clip =
+    (xmin, ymin, xmax, ymax), відкидаються квадрати, чиє піддерево
+    гарантовано не перетинає цей прямокутник.
+    """
+    xs = np.array([x], dtype=np.float64)
+    ys = np.array([y], dtype=np.float64)
+    sizes = np.array([size], dtype=np.float64)
+    angles = np.array([angle], dtype=np.float64)
+    reach = subtree_reach(branch)
+
+    for _ in range(depth):
+        if clip is not None:
+            r = sizes * reach
+            keep = ((xs + r >= clip[0]) & (xs - r <= clip[2]) &
+                    (ys + r >= clip[1]) & (ys - r <= clip[3]))
+            xs, ys, sizes, angles = xs[keep], ys[keep], sizes[keep], angles[keep]
+        if not len(xs):
+            return
+        squares = _square_vertices(xs, ys, sizes, angles)
+        yield squares
+
+        if min_size > 0:
+            grow = sizes >= min_size
+            squares, sizes, angles = squares[grow], sizes[grow], angles[grow]
+        xs, ys, sizes, angles = _children(squares, sizes, angles, branch)
+
+
+# Глибина шаблонного піддерева, яке переноситься подібністю на кожен вузол
+TEMPLATE_DEPTH = 12
+
+# Орієнтовна кількість квадратів в одній порції потокового генератора
+STREAM_BATCH = 1 << 16
+
+
+def _similarity(states, template):
+    """
+    Переносить шаблон (M, 4, 2), побудований від одиничного кореня (0, 0, 1, 0),
+    на кожен вузол states = (xs, ys, sizes, angles); результат (N·M, 4, 2).
+    Піддерево будь-якого вузла — подібна копія дерева від одиничного кореня.
+    """
+    xs, ys, sizes, angles = states
+    c = (sizes * np.cos(angles))[:, None, None]
+    s = (sizes * np.sin(angles))[:, None, None]
+    tx, ty = template[None, ..., 0], template[None, ..., 1]
+    out = np.empty((len(xs),) + template.shape)
+    out[..., 0] = xs[:, None, None] + c * tx - s * ty
+    out[..., 1] = ys[:, None, None] + s * tx + c * ty
+    return out.reshape(-1, 4, 2)
+
+
+def _preorder_template(depth, branch):
+    """Шаблонне піддерево глибини depth у прямому порядку: (рівні, квадрати)."""
+    levels = list(pythagoras_levels(0.0, 0.0, 1.0, 0.0, depth, branch=branch))
+    order = []
+    stack = [(0, 0)]
+    while stack:
+        k, i = stack.pop()
+        order.append((k, i))
+        if k + 1 < depth:
+            # У рівні k+1 лівий нащадок i-го вузла має індекс i, правий — i + 2^k
+            stack.append((k + 1, i + (1 << k)))
+            stack.append((k + 1, i))
+    ks = np.array([k for k, _ in order], dtype=np.int64)
+    squares = np.stack([levels[k][i] for k, i in order])
+    return ks, squares
+
+
+def iter_squares(x, y, size, angle, depth, order='dfs', branch=DEFAULT_BRANCHING,
+                 batch=STREAM_BATCH):
+    """
+    Лінивий генератор квадратів дерева порціями (рівні (n,), вершини (n, 4, 2)).
+
+    order='dfs' — прямий обхід у глибину: верхні рівні обходяться явним
+    стеком, а кожне піддерево висоти не більше TEMPLATE_DEPTH видається
+    однією порцією як подібна копія заздалегідь побудованого шаблону.
+    order='bfs' — рівень за рівнем; рівень k отримується з вузлів рівня
+    k - TEMPLATE_DEPTH + 1 і останнього рівня шаблону.
+
+    Пам'ять обмежена розміром шаблону та порції, а не 2^depth квадратами.
+    """
+    if depth <= 0:
+        return
+    d = min(depth, TEMPLATE_DEPTH)
+    root = tuple(np.array([v], dtype=np.float64) for v in (x, y, size, angle))
+
+    if order == 'dfs':
+        tpl_levels, tpl_squares = _preorder_template(d, branch)
+        stack = [(root, 0)]
+        while stack:
+            state, level = stack.pop()
+            remaining = depth - level
+            if remaining <= d:
+                keep = tpl_levels < remaining
+                yield tpl_levels[keep] + level, _similarity(state, tpl_squares[keep])
+                continue
+            squares = _square_vertices(*state)
+            yield np.array([level]), squares
+            children = _children(squares, state[2], state[3], branch)
+            stack.append((tuple(c[1:] for c in children), level + 1))
+            stack.append((tuple(c[:1] for c in children), level + 1))
+    elif order == 'bfs':
+        templates = list(pythagoras_levels(0.0, 0.0, 1.0, 0.0, d, branch=branch))
+        states, base = root, 0
+        for k in range(depth):
+            j = min(k, d - 1)
+            while base < k - j:
+                squares = _square_vertices(*states)
+                states = _children(squares, states[2], states[3], branch)
+                base += 1
+            tpl = templates[j]
+            step = max(1, batch // len(tpl))
+            for a in range(0, len(states[0]), step):
+                part = tuple(v[a:a + step] for v in states)
+                out = _similarity(part, tpl)
+                yield np.full(len(out), k, dtype=np.int64), out
+    else:
+        raise ValueError(f"Невідомий порядок обходу: {order}")
+
+
+def level_colors(depth, scheme=None):
+    """
+    Кольори рівнів RGBA (depth, 4): scheme — пара кольорів (стовбур, листя)
+    для лінійної інтерполяції або назва колірної карти matplotlib;
+    за замовчуванням від TRUNK_COLOR (корінь) до LEAF_COLOR (листя).
+    """
+    t = np.linspace(0.0, 1.0, depth)[:, None] if depth > 1 else np.zeros((1, 1))
+    if isinstance(scheme, str):
+        return np.asarray(plt.get_cmap(scheme)(t[:, 0]))
+    trunk_color, leaf_color = scheme or (TRUNK_COLOR, LEAF_COLOR)
+    trunk = np.array(to_rgba(trunk_color))
+    leaf = np.array(to_rgba(leaf_color))
+    return trunk * (1 - t) + leaf * t
+
+
+# Коди вершин замкненого квадрата в складеному шляху рівня
+SQUARE_CODES = np.array([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO,
+                         Path.CLOSEPOLY], dtype=Path.code_type)
+
+
+def level_path(squares):
+    """Один складений Path з усіх квадратів рівня (масив форми (N, 4, 2))."""
+    verts = np.concatenate([squares, squares[:, :1]], axis=1).reshape(-1, 2)
+    return Path(verts, np.tile(SQUARE_CODES, len(squares)))
+
+
+def draw_pythagoras_tree(ax, x, y, size, angle, depth, branch=DEFAULT_BRANCHING, scheme=None):
+    """
+    Малює дерево Піфагора однією колекцією: геометрія будується рівнями
+    через pythagoras_levels, і кожен рівень стає одним складеним шляхом
+    зі своїм кольором. Так колекція містить depth елементів, а не 2^depth
+    окремих полігонів, і matplotlib не створює об'єкт на кожен квадрат.
+    """
+    if depth <= 0:
+        return None
+    paths = []
+    lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+    for squares in pythagoras_levels(x, y, size, angle, depth, branch=branch):
+        paths.append(level_path(squares))
+        pts = squares.reshape(-1, 2)
+        lo = np.minimum(lo, pts.min(axis=0))
+        hi = np.maximum(hi, pts.max(axis=0))
+    # На великій глибині контури лише зафарбовують дрібні квадрати
+    linewidth = 0.5 if depth <= 10 else 0.0
+    colors = level_colors(depth, scheme)
+    collection = PathCollection(paths, facecolors=colors,
+                                edgecolors=colors[:1], linewidths=linewidth,
+                                transform=ax.transData)
+    ax.add_collection(collection, autolim=False)
+    ax.set_xlim(lo[0], hi[0])
+    ax.set_ylim(lo[1], hi[1])
+    return collection
+
+
+# Кількість пікселів, що перевіряються за один векторизований крок растеризації
+RASTER_BATCH = 1 << 22
+
+
+def tree_bounds(x, y, size, angle, depth, branch=DEFAULT_BRANCHING, probe_depth=12):
+    """
+    Консервативні межі дерева (xmin, ymin, xmax, ymax): точні межі перших
+    probe_depth рівнів, розширені на радіус піддерев останнього рівня.
+    """
+    lo, hi = np.full(2, np.inf), np.full(2, -np.inf)
+    last_size = size
+    for squares in pythagoras_levels(x, y, size, angle, min(depth, probe_depth), branch=branch):
+        pts = squares.reshape(-1, 2)
+        lo = np.minimum(lo, pts.min(axis=0))
+        hi = np.maximum(hi, pts.max(axis=0))
+        last_size = np.linalg.norm(squares[:, 1] - squares[:, 0], axis=1).max()
+    if depth > probe_depth:
+        r = max(branch.left_ratio, branch.right_ratio)
+        pad = last_size * r * subtree_reach(branch)
+        lo, hi = lo - pad, hi + pad
+    return (*lo, *hi)
+
+
+def _paint(img, quads, color):
+    """
+    Зафарбовує опуклі чотирикутники quads (N, 4, 2; піксельні координати
+    тайла, y донизу) кольором color. Піксель належить квадрату, якщо його
+    центр лежить з одного боку від усіх чотирьох ребер. Субпіксельні
+    квадрати зафарбовують піксель свого центру. Субпіксельність визначається
+    за рамкою до обрізання тайлом, тож великий квадрат, від якого в тайл
+    потрапив лише кут, малюється так само, як і без поділу на тайли.
+    """
+    h, w = img.shape[:2]
+    lo = np.floor(quads.min(axis=1)).astype(np.int64)
+    hi = np.ceil(quads.max(axis=1)).astype(np.int64)
+    small = (hi - lo).max(axis=1) <= 1
+    lo = np.maximum(lo, 0)
+    hi = np.minimum(hi, [w, h])
+    visible = np.all(hi > lo, axis=1)
+    quads, lo, hi, small = quads[visible], lo[visible], hi[visible], small[visible]
+    if not len(quads):
         return
-    dx = size * np.cos(angle)
-    dy = size * np.sin(angle)
-    pdx = -dy
-    pdy = dx
+    extent = (hi - lo).max(axis=1)
+
+    if small.any():
+        c = np.floor(quads[small].mean(axis=1)).astype(np.int64)
+        ok = (c[:, 0] >= 0) & (c[:, 0] < w) & (c[:, 1] >= 0) & (c[:, 1] < h)
+        img[c[ok, 1], c[ok, 0]] = color
+
+    # Групуємо квадрати за розміром рамки (степені двійки), щоб перевіряти
+    # усі пікселі групи одним тензором форми (n, B, B)
+    buckets = np.where(small, 0, 1 << np.ceil(np.log2(np.maximum(extent, 1))).astype(np.int64))
+    for side in np.unique(buckets[buckets > 0]):
+        sel = np.nonzero(buckets == side)[0]
+        grid = np.arange(side)
+        step = max(1, RASTER_BATCH // (side * side))
+        for start in range(0, len(sel), step):
+            idx = sel[start:start + step]
+            q = quads[idx]
+            px = (lo[idx, 0, None, None] + grid[None, None, :]).astype(np.float64) + 0.5
+            py = (lo[idx, 1, None, None] + grid[None, :, None]).astype(np.float64) + 0.5
+            px, py = np.broadcast_arrays(px, py)
+            pos = np.ones(px.shape, dtype=bool)
+            neg = np.ones(px.shape, dtype=bool)
+            for i in range(4):
+                x0 = q[:, i, 0, None, None]
+                y0 = q[:, i, 1, None, None]
+                ex = q[:, (i + 1) % 4, 0, None, None] - x0
+                ey = q[:, (i + 1) % 4, 1, None, None] - y0
+                cross = ex * (py - y0) - ey * (px - x0)
+                pos &= cross >= 0
+                neg &= cross <= 0
+            inside = (pos | neg) & (px < hi[idx, 0, None, None]) & (py < hi[idx, 1, None, None])
+            n, iy, ix = np.nonzero(inside)
+            img[lo[idx[n], 1] + iy, lo[idx[n], 0] + ix] = color
+
+
+def render_tile(task):
+    """
+    Растеризує один тайл (x0, y0, tw, th у пікселях) у буфер RGBA uint8.
+    Геометрія генерується лише для піддерев, що перетинають тайл, і не
+    розгалужується нижче розміру одного пікселя.
+    """
+    root, depth, branch, scheme, bounds, scale, (x0, y0, tw, th) = task
+    xmin, _, _, ymax = bounds
+    img = np.full((th, tw, 4), 255, dtype=np.uint8)
+    clip = (xmin + x0 / scale, ymax - (y0 + th) / scale,
+            xmin + (x0 + tw) / scale, ymax - y0 / scale)
+    colors = np.round(level_colors(depth, scheme) * 255).astype(np.uint8)
+    for level, squares in enumerate(pythagoras_levels(*root, depth, min_size=1.0 / scale,
+                                                      clip=clip, branch=branch)):
+        px = np.empty_like(squares)
+        px[..., 0] = (squares[..., 0] - xmin) * scale - x0
+        px[..., 1] = (ymax - squares[..., 1]) * scale - y0
+        _paint(img, px, colors[level])
+    return img
 
-    p0 = np.array([x, y])
-    p1 = p0 + np.array([dx, dy])
-    p2 = p1 + np.array([pdx, pdy])
-    p3 = p0 + np.array([pdx, pdy])
 
-    square = np.vstack([p0, p1, p2, p3])
-    patch = Polygon(square, closed=True,
-                    edgecolor='saddlebrown', facecolor='lightgreen')
-    ax.add_patch(patch)
+def _png_chunk(f, kind: bytes, data: bytes):
+    f.write(struct.pack('>I', len(data)))
+    f.write(kind + data)
+    f.write(struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
 
-    theta = np.pi / 4
-    size_left  = size * np.cos(theta)
-    size_right = size * np.sin(theta)
 
-    draw_pythagoras_tree(ax, p3[0], p3[1], size_left,  angle + theta, depth-1)
-    draw_pythagoras_tree(ax, p2[0], p2[1], size_right, angle - theta, depth-1)
+def write_png(path, width, height, bands):
+    """
+    Потоково записує RGBA PNG: bands — ітератор горизонтальних смуг
+    (h_i, width, 4) uint8 (C-суцільних). Рядки стискаються по одному прямо
+    з буфера смуги, без копії з байтами фільтра, тож смугу можна
+    перевикористовувати після того, як її видано.
+    """
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        _png_chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+        comp = zlib.compressobj(6)
+        for band in bands:
+            for row in band:
+                # фільтр 0 на кожен рядок, далі самі пікселі рядка
+                data = comp.compress(b'\x00') + comp.compress(memoryview(row))
+                if data:
+                    _png_chunk(f, b'IDAT', data)
+        _png_chunk(f, b'IDAT', comp.flush())
+        _png_chunk(f, b'IEND', b'')
+
+
+def render_raster(output, depth, width, root=(-0.5, 0.0, 1.0, 0.0), tile=1024, workers=1,
+                  branch=DEFAULT_BRANCHING, scheme=None):
+    """
+    Растровий рендер без артистів matplotlib: зображення ділиться на тайли
+    tile×tile, тайли однієї смуги рендеряться (за workers > 1 — паралельно
+    в пулі процесів), копіюються в один перевикористовуваний буфер смуги
+    і смуга одразу дописується у PNG. PNG зберігає зображення цілими
+    рядками, тож пам'ять — це одна смуга на всю ширину (tile·width·4 байт)
+    плюс тайли, що рендеряться; від висоти зображення вона не залежить.
+    """
+    bounds = tree_bounds(*root, depth, branch=branch)
+    xmin, ymin, xmax, ymax = bounds
+    scale = width / (xmax - xmin)
+    height = int(np.ceil((ymax - ymin) * scale))
+
+    def bands(pool):
+        band = np.empty((min(tile, height), width, 4), dtype=np.uint8)
+        for y0 in range(0, height, tile):
+            th = min(tile, height - y0)
+            tasks = [(root, depth, branch, scheme, bounds, scale, (x0, y0, min(tile, width - x0), th))
+                     for x0 in range(0, width, tile)]
+            tiles = pool.imap(render_tile, tasks) if pool else map(render_tile, tasks)
+            for (_, _, _, _, _, _, (x0, _, tw, _)), img in zip(tasks, tiles):
+                band[:th, x0:x0 + tw] = img
+            yield band[:th]
+
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            write_png(output, width, height, bands(pool))
+    else:
+        write_png(output, width, height, bands(None))
+    return width, height
+
+
+# Рядок SVG на один квадрат: клас рівня і замкнений контур з чотирьох вершин
+SVG_ROW = '<path class="l%d" d="M%.6g %.6gL%.6g %.6gL%.6g %.6gL%.6g %.6gZ"/>'
+
+
+def export_svg(path, batches, bounds, colors):
+    """
+    Потоково записує порції (рівні, квадрати) у SVG: кольори рівнів задані
+    класами CSS у заголовку, а кожна порція дописується й звільняється.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    w, h = xmax - xmin, ymax - ymin
+    with open(path, 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'width="1000" height="{1000 * h / w:.0f}" '
+                f'viewBox="{xmin:.6g} {-ymax:.6g} {w:.6g} {h:.6g}">\n<style>\n')
+        for k, color in enumerate(colors):
+            f.write(f'.l{k}{{fill:{to_hex(color)}}}\n')
+        # Вісь y у SVG напрямлена донизу, тож дзеркалимо всю групу
+        f.write('</style>\n<g transform="scale(1,-1)">\n')
+        for levels, squares in batches:
+            np.savetxt(f, np.column_stack([levels, squares.reshape(-1, 8)]), fmt=SVG_ROW)
+        f.write('</g>\n</svg>\n')
+
+
+def export_npy(path, batches, count):
+    """
+    Потоково записує вершини у файл .npy формату float32 (count, 4, 2) через
+    memmap: у пам'яті лише поточна порція. Для order='bfs' рівень k займає
+    рядки [2^k - 1, 2^(k+1) - 1).
+    """
+    buf = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(count, 4, 2))
+    pos = 0
+    for _, squares in batches:
+        buf[pos:pos + len(squares)] = squares
+        pos += len(squares)
+    buf.flush()
+    del buf
+    return pos
+
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Фрактал «дерево Піфагора» з рекурсією"
+        description="Фрактал «дерево Піфагора»"
     )
     parser.add_argument('-d', '--depth', type=int, default=6,
-                        help="Рівень рекурсії (за замовчуванням: 6)")
+                        help="Глибина дерева (за замовчуванням: 6)")
     parser.add_argument('-o', '--output', default='tree.png',
                         help="Файл для збереження зображення (за замовчуванням: tree.png)")
+    parser.add_argument('-r', '--renderer', choices=('matplotlib', 'raster'), default='matplotlib',
+                        help="matplotlib (векторний) або raster (прямий RGBA-буфер, тайли)")
+    parser.add_argument('-W', '--width', type=int, default=2400,
+                        help="Ширина растрового зображення в пікселях (за замовчуванням: 2400)")
+    parser.add_argument('--tile', type=int, default=1024,
+                        help="Розмір тайла растрового рендера (за замовчуванням: 1024)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Кількість процесів для рендера тайлів (за замовчуванням: 1)")
+    parser.add_argument('-a', '--angle', type=float, default=np.degrees(THETA),
+                        help="Кут розгалуження лівого нащадка в градусах (за замовчуванням: 45)")
+    parser.add_argument('--right-angle', type=float,
+                        help="Кут правого нащадка в градусах для асиметричного дерева "
+                             "(за замовчуванням: як --angle)")
+    parser.add_argument('--ratio', type=float, nargs='+', metavar='R',
+                        help="Коефіцієнт зменшення нащадків: один для обох або два (лівий правий); "
+                             "за замовчуванням cos і sin кутів")
+    parser.add_argument('--colors', nargs=2, metavar=('TRUNK', 'LEAF'),
+                        help=f"Кольори стовбура та листя (за замовчуванням: {TRUNK_COLOR} {LEAF_COLOR})")
+    parser.add_argument('--cmap', help="Колірна карта matplotlib для рівнів замість --colors")
+    parser.add_argument('--svg', help="Потоково експортувати квадрати у SVG замість рендера")
+    parser.add_argument('--npy', help="Потоково експортувати вершини у float32 .npy замість рендера")
+    parser.add_argument('--order', choices=('dfs', 'bfs'), default='dfs',
+                        help="Порядок квадратів під час експорту (за замовчуванням: dfs)")
     args = parser.parse_args()
 
+    if args.ratio is not None and len(args.ratio) > 2:
+        parser.error("--ratio приймає одне або два значення")
+    right = np.radians(args.right_angle) if args.right_angle is not None else None
+    ratio = args.ratio[0] if args.ratio and len(args.ratio) == 1 else args.ratio
+    try:
+        branch = make_branching(np.radians(args.angle), right, ratio)
+    except ValueError as e:
+        parser.error(str(e))
+    scheme = args.cmap or args.colors
+    root = (-0.5, 0.0, 1.0, 0.0)
+
+    if args.svg or args.npy:
+        if args.svg:
+            bounds = tree_bounds(*root, args.depth, branch=branch)
+            export_svg(args.svg, iter_squares(*root, args.depth, args.order, branch),
+                       bounds, level_colors(args.depth, scheme))
+            print(f"SVG збережено у файл: {args.svg}")
+        if args.npy:
+            count = export_npy(args.npy, iter_squares(*root, args.depth, args.order, branch),
+                               (1 << args.depth) - 1)
+            print(f"{count} квадратів збережено у файл: {args.npy}")
+        return
+
+    if args.renderer == 'raster':
+        w, h = render_raster(args.output, args.depth, args.width, root=root,
+                             tile=args.tile, workers=args.workers,
+                             branch=branch, scheme=scheme)
+        print(f"Фрактал ({w}×{h}) збережено у файл: {args.output}")
+        return
+
     fig, ax = plt.subplots(figsize=(8, 8))
     ax.set_aspect('equal')
     ax.axis('off')
 
-    draw_pythagoras_tree(ax, x=-0.5, y=0.0, size=1.0, angle=0.0, depth=args.depth)
-    ax.relim(); ax.autoscale_view()
+    draw_pythagoras_tree(ax, *root, depth=args.depth, branch=branch, scheme=scheme)
 
     plt.tight_layout()
     plt.savefig(args.output, dpi=300)
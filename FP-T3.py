@@ -1,12 +1,1132 @@
 #!/usr/bin/env python3
 import heapq
 import argparse
+import contextlib
+import io
+import math
+import mmap
+import multiprocessing
+import numbers
 import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from array import array
+from collections import namedtuple
+from multiprocessing import shared_memory
 
-def dijkstra(graph: dict, start: str) -> dict:
+class IdNames:
+    """
+    Імена вершин виду str(base + i) без зберігання n окремих рядків.
+    Використовується для графів з числовими id (DIMACS, синтетичні графи).
+    """
+    def __init__(self, n: int, base: int = 0):
+        self.n = n
+        self.base = base
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return str(self.base + i)
+
+    def __iter__(self):
+        return map(str, range(self.base, self.base + self.n))
+
+    def index(self) -> '_IdLookup':
+        return _IdLookup(self)
+
+
+class _IdLookup:
+    """Відображення ім'я → id для IdNames: розбір числа замість словника."""
+    def __init__(self, names: IdNames):
+        self.names = names
+
+    def __getitem__(self, name: str) -> int:
+        try:
+            i = int(name) - self.names.base
+        except ValueError:
+            raise KeyError(name) from None
+        if not 0 <= i < self.names.n:
+            raise KeyError(name)
+        return i
+
+    def __contains__(self, name) -> bool:
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+
+class CSRGraph:
+    """
+    Компактний орієнтований граф у форматі CSR (compressed sparse row).
+    Імена вершин інтернуються в цілі id 0..n-1; ребра вершини u — це
+    targets[offsets[u]:offsets[u+1]] з вагами weights[...] того ж діапазону.
+    Усі буфери — суцільні масиви NumPy без Python-об'єктів на ребро.
+    """
+    def __init__(self, names: list, offsets: np.ndarray, targets: np.ndarray,
+                 weights: np.ndarray, coords: np.ndarray = None):
+        self.names = names
+        if isinstance(names, IdNames):
+            self.ids = names.index()
+        else:
+            self.ids = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        # Необов'язкові координати вершин (n, 2) для евристик A*
+        self.coords = coords
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_edges(cls, names: list, src, dst, weights, coords=None) -> 'CSRGraph':
+        """
+        Будує CSR з трьох паралельних масивів ребер (id початку, id кінця, вага)
+        стабільним сортуванням за початком ребра.
+        """
+        n = len(names)
+        src = np.asarray(src, dtype=np.int64)
+        order = np.argsort(src, kind='stable')
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        targets = np.asarray(dst, dtype=np.int32 if n < 2**31 else np.int64)[order]
+        weights = np.asarray(weights, dtype=np.float64)[order]
+        return cls(names, offsets, targets, weights, coords)
+
+    @classmethod
+    def from_adjacency(cls, graph: dict) -> 'CSRGraph':
+        """Перетворює словник списків суміжності {u: [(v, w), ...]} у CSR."""
+        ids = {}
+        for u in graph:
+            ids.setdefault(u, len(ids))
+        src, dst, wts = [], [], []
+        for u, edges in graph.items():
+            ui = ids[u]
+            for v, w in edges:
+                src.append(ui)
+                dst.append(ids.setdefault(v, len(ids)))
+                wts.append(w)
+        return cls.from_edges(list(ids), src, dst, wts)
+
+    def neighbors(self, u: int):
+        """Ітерує пари (v, w) для вихідних ребер вершини з id u."""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist())
+
+    def to_adjacency(self) -> dict:
+        """Зворотне перетворення у словник списків суміжності з іменами вершин."""
+        names = self.names
+        return {names[u]: [(names[v], w) for v, w in self.neighbors(u)]
+                for u in range(self.num_nodes)}
+
+    def sources(self) -> np.ndarray:
+        """Масив початків ребер, паралельний targets/weights."""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.offsets))
+
+    def reverse(self) -> 'CSRGraph':
+        """Граф з оберненими ребрами (кешується); потрібен для пошуку від цілі."""
+        if getattr(self, '_reverse', None) is None:
+            self._reverse = CSRGraph.from_edges(self.names, self.targets, self.sources(),
+                                                self.weights, self.coords)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def nbytes(self) -> int:
+        """Розмір буферів ребер і зміщень у байтах."""
+        return self.offsets.nbytes + self.targets.nbytes + self.weights.nbytes
+
+
+# Обсяг тексту (байт), що читається за один крок потокового завантажувача
+READ_CHUNK = 1 << 24
+
+GRAPH_MAGIC = b'CSRGRPH1'
+
+
+def _read_chunks(path: str):
+    """Читає текстовий файл порціями рядків сумарним обсягом ≈ READ_CHUNK."""
+    with open(path, encoding='utf-8') as f:
+        while True:
+            lines = f.readlines(READ_CHUNK)
+            if not lines:
+                return
+            yield lines
+
+
+def _append(buf: array, values: np.ndarray):
+    """Дописує масив NumPy у буфер array без поелементних Python-об'єктів."""
+    buf.frombytes(np.ascontiguousarray(values, dtype=np.dtype(buf.typecode)).tobytes())
+
+
+def load_dimacs(path: str) -> CSRGraph:
+    """
+    Завантажує граф у форматі DIMACS (.gr): рядки «p sp n m» та «a u v w»
+    з 1-базованими id. Дуги кожної порції розбираються одним викликом
+    np.fromstring прямо в масиви, розмір яких відомий із заголовка.
+    """
+    n = m = None
+    src = dst = w = None
+    pos = 0
+    for lines in _read_chunks(path):
+        arcs = []
+        for line in lines:
+            if line.startswith('a'):
+                arcs.append(line[1:])
+            elif line.startswith('p'):
+                _, _, n, m = line.split()
+                n, m = int(n), int(m)
+                src = np.empty(m, dtype=np.int64)
+                dst = np.empty(m, dtype=np.int64)
+                w = np.empty(m, dtype=np.float64)
+        if not arcs:
+            continue
+        if src is None:
+            raise ValueError(f"{path}: рядок 'a' перед заголовком 'p sp n m'")
+        vals = np.fromstring(''.join(arcs), dtype=np.float64, sep=' ').reshape(-1, 3)
+        k = len(vals)
+        src[pos:pos + k] = vals[:, 0] - 1
+        dst[pos:pos + k] = vals[:, 1] - 1
+        w[pos:pos + k] = vals[:, 2]
+        pos += k
+    if n is None:
+        raise ValueError(f"{path}: відсутній заголовок 'p sp n m'")
+    return CSRGraph.from_edges(IdNames(n, base=1), src[:pos], dst[:pos], w[:pos])
+
+
+# Назви стовпців, за якими двостовпцевий перший рядок визнається заголовком
+HEADER_NAMES = {'u', 'v', 'w', 'src', 'dst', 'source', 'target', 'from', 'to',
+                'weight', 'node', 'node1', 'node2'}
+
+
+def _is_header(parts: list, header: bool = None) -> bool:
+    """Чи є перший змістовний рядок списку ребер заголовком (див. load_edge_list)."""
+    if header is not None:
+        return header
+    fields = [p.strip().lower() for p in parts]
+    if len(fields) > 2 and fields[2]:
+        try:
+            float(fields[2])
+        except ValueError:
+            return True
+    return set(fields) <= HEADER_NAMES
+
+
+def load_edge_list(path: str, delimiter: str = None, undirected: bool = False,
+                   header: bool = None) -> CSRGraph:
+    """
+    Потоково завантажує список ребер «u v [w]» (CSV/TSV/пробіли; вага за
+    замовчуванням 1). Рядки з '#' на початку пропускаються. Заголовком може
+    бути лише перший змістовний рядок: header=True — пропустити його,
+    False — ні, None — визначити самостійно (нечислова вага або назви
+    стовпців з HEADER_NAMES). Інші рядки, що не розбираються, не
+    відкидаються мовчки: після читання піднімається ValueError з їхньою
+    кількістю та номером першого. Імена інтернуються в id, а ребра одразу
+    пишуться в буфери array('q')/array('d') — без кортежу на кожне ребро.
+    """
+    ids = {}
+    src, dst, wts = array('q'), array('q'), array('d')
+    first = True
+    bad, first_bad = 0, None
+    lineno = 0
+    for lines in _read_chunks(path):
+        s_chunk, d_chunk, w_chunk = [], [], []
+        for line in lines:
+            lineno += 1
+            if not line.strip() or line.startswith('#'):
+                continue
+            parts = line.rstrip('\r\n').split(delimiter)
+            if first:
+                first = False
+                if _is_header(parts, header):
+                    continue
+            try:
+                weight = float(parts[2]) if len(parts) > 2 and parts[2].strip() else 1.0
+                u, v = parts[0].strip(), parts[1].strip()
+            except (ValueError, IndexError):
+                bad += 1
+                first_bad = first_bad or lineno
+                continue
+            s_chunk.append(ids.setdefault(u, len(ids)))
+            d_chunk.append(ids.setdefault(v, len(ids)))
+            w_chunk.append(weight)
+        src.extend(s_chunk)
+        dst.extend(d_chunk)
+        wts.extend(w_chunk)
+    if bad:
+        raise ValueError(f"{path}: {bad} рядків не розібрано (перший — рядок {first_bad})")
+    src = np.frombuffer(src, dtype=np.int64)
+    dst = np.frombuffer(dst, dtype=np.int64)
+    wts = np.frombuffer(wts, dtype=np.float64)
+    if undirected:
+        src, dst, wts = np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([wts, wts])
+    return CSRGraph.from_edges(list(ids), src, dst, wts)
+
+
+def save_binary(g: CSRGraph, path: str):
+    """
+    Зберігає граф у бінарному форматі: GRAPH_MAGIC, заголовок int64
+    (n, m, розмір id у targets, тип імен, base, довжина блоку імен),
+    далі offsets, targets, weights (кожен вирівняний на 8 байт) і
+    блок імен UTF-8, розділених '\\n' (порожній для IdNames).
+    """
+    if isinstance(g.names, IdNames):
+        kind, base, blob = 0, g.names.base, b''
+    else:
+        kind, base, blob = 1, 0, '\n'.join(g.names).encode('utf-8')
+    header = np.array([g.num_nodes, g.num_edges, g.targets.itemsize, kind, base, len(blob)],
+                      dtype=np.int64)
+    with open(path, 'wb') as f:
+        f.write(GRAPH_MAGIC)
+        f.write(header.tobytes())
+        for arr in (g.offsets, g.targets, g.weights):
+            data = np.ascontiguousarray(arr).tobytes()
+            f.write(data)
+            f.write(b'\0' * (-len(data) % 8))
+        f.write(blob)
+
+
+def load_binary(path: str) -> CSRGraph:
+    """
+    Завантажує бінарний граф через mmap: offsets/targets/weights — це
+    np.frombuffer над відображеною пам'яттю, тобто без копіювання.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(GRAPH_MAGIC)] != GRAPH_MAGIC:
+        raise ValueError(f"{path}: не є бінарним файлом графа")
+    pos = len(GRAPH_MAGIC)
+    n, m, id_size, kind, base, blob_len = np.frombuffer(mm, np.int64, 6, pos).tolist()
+    pos += 48
+    arrays = []
+    for dtype, count in ((np.int64, n + 1), (np.int32 if id_size == 4 else np.int64, m),
+                         (np.float64, m)):
+        arrays.append(np.frombuffer(mm, dtype, count, pos))
+        pos += count * np.dtype(dtype).itemsize
+        pos += -pos % 8
+    if kind == 0:
+        names = IdNames(n, base)
+    else:
+        names = mm[pos:pos + blob_len].decode('utf-8').split('\n')
+    return CSRGraph(names, *arrays)
+
+
+def load_graph(path: str, undirected: bool = False, header: bool = None) -> CSRGraph:
+    """Обирає завантажувач за розширенням: .gr, .csv, .tsv, .bin; інакше — пробіли."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.gr':
+        return load_dimacs(path)
+    if ext in ('.bin', '.csrg'):
+        return load_binary(path)
+    delimiter = {'.csv': ',', '.tsv': '\t'}.get(ext)
+    return load_edge_list(path, delimiter, undirected, header)
+
+
+class LazyHeap:
+    """
+    Бінарна купа heapq з лінивим видаленням: push завжди додає новий запис,
+    застарілі записи відкидаються під час pop. Купа може зрости до O(E).
+    """
+    def __init__(self, n: int, max_weight: float = None):
+        self.heap = []
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, v: int, key: float):
+        heapq.heappush(self.heap, (key, v))
+        self.pushes += 1
+        if len(self.heap) > self.peak:
+            self.peak = len(self.heap)
+
+    def pop(self):
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+
+class IndexedHeap:
+    """
+    Індексована бінарна купа зі справжнім decrease-key: кожна вершина
+    присутня не більше одного разу, pos[v] — її позиція в масиві купи.
+    Розмір купи обмежений O(V).
+    """
+    def __init__(self, n: int, max_weight: float = None):
+        self.heap = []
+        self.keys = [0.0] * n
+        self.pos = [-1] * n
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _sift_up(self, i: int):
+        heap, keys, pos = self.heap, self.keys, self.pos
+        v = heap[i]
+        k = keys[v]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if keys[p] <= k:
+                break
+            heap[i] = p
+            pos[p] = i
+            i = parent
+        heap[i] = v
+        pos[v] = i
+
+    def _sift_down(self, i: int):
+        heap, keys, pos = self.heap, self.keys, self.pos
+        n = len(heap)
+        v = heap[i]
+        k = keys[v]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            c = heap[child]
+            if k <= keys[c]:
+                break
+            heap[i] = c
+            pos[c] = i
+            i = child
+        heap[i] = v
+        pos[v] = i
+
+    def push(self, v: int, key: float):
+        """Вставляє v або зменшує її ключ, якщо вона вже в купі."""
+        self.pushes += 1
+        self.keys[v] = key
+        i = self.pos[v]
+        if i < 0:
+            self.heap.append(v)
+            i = len(self.heap) - 1
+            if len(self.heap) > self.peak:
+                self.peak = len(self.heap)
+        self._sift_up(i)
+
+    def pop(self):
+        self.pops += 1
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.pos[top] = -1
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
+        return self.keys[top], top
+
+
+class PairingHeap:
+    """
+    Pairing heap над паралельними масивами (child, sibling, prev), індексованими
+    id вершини. decrease-key вирізає піддерево і зливає його з коренем за O(1),
+    видалення мінімуму — двопрохідне злиття дітей кореня.
+    """
+    def __init__(self, n: int, max_weight: float = None):
+        self.keys = [0.0] * n
+        self.child = [-1] * n
+        self.sibling = [-1] * n
+        self.prev = [-1] * n  # лівий брат або батько
+        self.in_heap = [False] * n
+        self.root = -1
+        self.size = 0
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self):
+        return self.size
+
+    def _link(self, a: int, b: int) -> int:
+        if a < 0:
+            return b
+        if b < 0:
+            return a
+        keys, child, sibling, prev = self.keys, self.child, self.sibling, self.prev
+        if keys[b] < keys[a]:
+            a, b = b, a
+        # b стає першою дитиною a
+        first = child[a]
+        sibling[b] = first
+        if first >= 0:
+            prev[first] = b
+        prev[b] = a
+        child[a] = b
+        return a
+
+    def _cut(self, v: int):
+        child, sibling, prev = self.child, self.sibling, self.prev
+        p, s = prev[v], sibling[v]
+        if child[p] == v:
+            child[p] = s
+        else:
+            sibling[p] = s
+        if s >= 0:
+            prev[s] = p
+        sibling[v] = prev[v] = -1
+
+    def push(self, v: int, key: float):
+        """Вставляє v або зменшує її ключ, якщо вона вже в купі."""
+        self.pushes += 1
+        self.keys[v] = key
+        if self.in_heap[v]:
+            if v != self.root:
+                self._cut(v)
+                self.root = self._link(self.root, v)
+            return
+        self.in_heap[v] = True
+        self.child[v] = self.sibling[v] = self.prev[v] = -1
+        self.root = self._link(self.root, v)
+        self.size += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        self.pops += 1
+        top = self.root
+        child, sibling, prev = self.child, self.sibling, self.prev
+        # Перший прохід: зливаємо дітей попарно зліва направо
+        pairs = []
+        c = child[top]
+        while c >= 0:
+            nxt = sibling[c]
+            sibling[c] = prev[c] = -1
+            if nxt >= 0:
+                after = sibling[nxt]
+                sibling[nxt] = prev[nxt] = -1
+                pairs.append(self._link(c, nxt))
+                c = after
+            else:
+                pairs.append(c)
+                c = -1
+        # Другий прохід: зливаємо пари справа наліво
+        root = -1
+        for h in reversed(pairs):
+            root = self._link(root, h)
+        self.root = root
+        child[top] = -1
+        self.in_heap[top] = False
+        self.size -= 1
+        return self.keys[top], top
+
+
+class BucketQueue:
+    """
+    Черга з кошиками (алгоритм Діала) для невід'ємних цілих ваг ≤ C.
+    Ключі в черзі завжди лежать у вікні [d, d + C], тому достатньо C + 1
+    циклічних кошиків; pop сканує кошики вперед від поточного мінімуму.
+    Застарілі записи (після зменшення відстані) відкидає сам алгоритм Дейкстри.
+    """
+    def __init__(self, n: int, max_weight: float = None):
+        if max_weight is None or max_weight != int(max_weight) or max_weight < 0:
+            raise ValueError("BucketQueue потребує невід'ємних цілих ваг")
+        self.width = int(max_weight) + 1
+        self.buckets = [[] for _ in range(self.width)]
+        self.current = 0
+        self.size = 0
+        self.pushes = self.pops = self.peak = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, v: int, key: float):
+        self.pushes += 1
+        self.buckets[int(key) % self.width].append(v)
+        self.size += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        self.pops += 1
+        buckets, width = self.buckets, self.width
+        d = self.current
+        while not buckets[d % width]:
+            d += 1
+        self.current = d
+        self.size -= 1
+        return float(d), buckets[d % width].pop()
+
+
+QUEUES = {
+    'heapq': LazyHeap,
+    'indexed': IndexedHeap,
+    'pairing': PairingHeap,
+    'dial': BucketQueue,
+}
+
+
+def dijkstra_csr(g: CSRGraph, source: int, queue='heapq'):
+    """
+    Алгоритм Дейкстри над буферами CSR.
+    queue — назва черги з пріоритетами з QUEUES або готовий екземпляр
+    (щоб після запуску прочитати його лічильники pushes/pops/peak).
+    Для 'heapq' використовується вбудований швидкий шлях без обгортки.
+    Повертає (dist, pred): масиви NumPy найкоротших відстаней від source
+    та попередників на найкоротших шляхах (-1 для source і недосяжних).
+    """
+    if queue == 'heapq':
+        return _dijkstra_heapq(g, source)
+    n = g.num_nodes
+    if isinstance(queue, BucketQueue) or QUEUES.get(queue) is BucketQueue:
+        # Кошики індексуються int(key): дробова вага мовчки дала б хибні відстані
+        w = g.weights
+        if not (np.all(w >= 0) and np.all(w == np.floor(w))):
+            raise ValueError("Черга 'dial' потребує невід'ємних цілих ваг усіх ребер")
+    if isinstance(queue, str):
+        max_weight = float(g.weights.max()) if g.num_edges else 0.0
+        queue = QUEUES[queue](n, max_weight)
+    dist_arr = np.full(n, np.inf)
+    pred_arr = np.full(n, -1, dtype=np.int64)
+    dist, pred = memoryview(dist_arr), memoryview(pred_arr)
+    offsets, targets, weights = (memoryview(g.offsets), memoryview(g.targets),
+                                 memoryview(g.weights))
+    push, pop = queue.push, queue.pop
+    dist[source] = 0.0
+    push(source, 0.0)
+    while len(queue):
+        dist_u, u = pop()
+        if dist_u > dist[u]:
+            continue  # застарілий запис (лише для лінивих черг)
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_dist = dist_u + weights[e]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                push(v, new_dist)
+    return dist_arr, pred_arr
+
+
+def _dijkstra_heapq(g: CSRGraph, source: int):
+    """Швидкий шлях dijkstra_csr: лінива бінарна купа heapq без обгортки."""
+    n = g.num_nodes
+    dist_arr = np.full(n, np.inf)
+    pred_arr = np.full(n, -1, dtype=np.int64)
+    # memoryview дає швидкий поелементний доступ без створення numpy-скалярів
+    dist, pred = memoryview(dist_arr), memoryview(pred_arr)
+    offsets, targets, weights = (memoryview(g.offsets), memoryview(g.targets),
+                                 memoryview(g.weights))
+    dist[source] = 0.0
+    pq = [(0.0, source)]
+    while pq:
+        dist_u, u = heapq.heappop(pq)
+        if dist_u > dist[u]:
+            continue  # застарілий запис у купі
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_dist = dist_u + weights[e]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                heapq.heappush(pq, (new_dist, v))
+    return dist_arr, pred_arr
+
+
+def dijkstra_multi(g: CSRGraph, sources):
+    """
+    Дейкстра з кількох джерел одночасно (віртуальне супер-джерело з ребрами
+    ваги 0 до кожного з sources). За один прохід повертає (dist, pred, origin):
+    відстань до найближчого джерела та id цього джерела (-1 для недосяжних).
+    """
+    n = g.num_nodes
+    dist_arr = np.full(n, np.inf)
+    pred_arr = np.full(n, -1, dtype=np.int64)
+    origin_arr = np.full(n, -1, dtype=np.int64)
+    dist, pred, origin = memoryview(dist_arr), memoryview(pred_arr), memoryview(origin_arr)
+    offsets, targets, weights = (memoryview(g.offsets), memoryview(g.targets),
+                                 memoryview(g.weights))
+    pq = []
+    for src in sources:
+        dist[src] = 0.0
+        origin[src] = src
+        pq.append((0.0, src))
+    heapq.heapify(pq)
+    while pq:
+        dist_u, u = heapq.heappop(pq)
+        if dist_u > dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_dist = dist_u + weights[e]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                origin[v] = origin[u]
+                heapq.heappush(pq, (new_dist, v))
+    return dist_arr, pred_arr, origin_arr
+
+
+# Стан процесу-воркера пакетного обчислення: граф зі спільної пам'яті та матриця
+_WORKER = {}
+
+
+def _share_graph(g: CSRGraph):
+    """
+    Копіює буфери CSR в один блок SharedMemory. Повертає (shm, meta), де meta —
+    дані для відновлення графа у воркері без пікління масивів.
+    """
+    parts = [np.ascontiguousarray(a) for a in (g.offsets, g.targets, g.weights)]
+    shm = shared_memory.SharedMemory(create=True, size=max(1, sum(a.nbytes for a in parts)))
+    layout, pos = [], 0
+    for a in parts:
+        np.frombuffer(shm.buf, a.dtype, a.size, pos)[:] = a
+        layout.append((a.dtype.str, a.size, pos))
+        pos += a.nbytes
+    return shm, (shm.name, layout)
+
+
+def _attach_graph(meta) -> tuple:
+    """Відновлює CSRGraph поверх спільної пам'яті (без копіювання)."""
+    name, layout = meta
+    shm = shared_memory.SharedMemory(name=name)
+    offsets, targets, weights = (np.frombuffer(shm.buf, np.dtype(dt), size, pos)
+                                 for dt, size, pos in layout)
+    return shm, CSRGraph(IdNames(len(offsets) - 1), offsets, targets, weights)
+
+
+def _batch_init(meta, matrix_path: str):
+    _WORKER['shm'], _WORKER['graph'] = _attach_graph(meta)
+    _WORKER['matrix'] = np.load(matrix_path, mmap_mode='r+')
+
+
+def _batch_row(task) -> int:
+    """Рахує рядок матриці відстаней для одного джерела і пише його у memmap."""
+    row, source = task
+    dist, _ = dijkstra_csr(_WORKER['graph'], source)
+    _WORKER['matrix'][row] = dist
+    return row
+
+
+def distance_matrix(g: CSRGraph, sources, path: str, workers: int = 1) -> np.memmap:
+    """
+    Матриця відстаней len(sources) × n, що записується у файл .npy (memmap).
+    При workers > 1 запуски dijkstra_csr розподіляються по пулу процесів:
+    граф передається через спільну пам'ять, а кожен воркер пише свої рядки
+    прямо у відображений файл, тож результати не пиклюються назад.
+    """
+    sources = list(sources)
+    matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64,
+                                       shape=(len(sources), g.num_nodes))
+    tasks = list(enumerate(sources))
+    if workers > 1:
+        matrix.flush()
+        shm, meta = _share_graph(g)
+        try:
+            with multiprocessing.Pool(workers, _batch_init, (meta, path)) as pool:
+                for _ in pool.imap_unordered(_batch_row, tasks):
+                    pass
+        finally:
+            shm.close()
+            shm.unlink()
+        return np.load(path, mmap_mode='r+')
+    for row, source in tasks:
+        matrix[row], _ = dijkstra_csr(g, source)
+    matrix.flush()
+    return matrix
+
+
+PathResult = namedtuple('PathResult', ['distance', 'path', 'settled'])
+PathResult.__doc__ = """
+Результат запиту s→t: довжина шляху (inf, якщо недосяжна), список вершин
+шляху від s до t (порожній, якщо недосяжна) та кількість остаточно
+оброблених (settled) вершин.
+"""
+
+
+def _walk(pred, v: int) -> list:
+    """
+    Відновлює шлях до v за попередниками (у зворотному порядку): pred —
+    словник або список, де pred[v] — попередник v, а -1 позначає джерело.
+    """
+    path = []
+    while v >= 0:
+        path.append(v)
+        v = pred[v]
+    return path
+
+
+def euclidean_heuristic(g: CSRGraph, target: int):
+    """
+    Евристика A* за координатами g.coords: евклідова відстань до target.
+    Допустима й монотонна, якщо вага кожного ребра не менша за довжину відрізка.
+    """
+    if g.coords is None:
+        raise ValueError("граф не має координат для евклідової евристики")
+    xs, ys = g.coords[:, 0].tolist(), g.coords[:, 1].tolist()
+    tx, ty = xs[target], ys[target]
+    return lambda v: math.hypot(xs[v] - tx, ys[v] - ty)
+
+
+def _astar(g: CSRGraph, s: int, t: int, heuristic=None) -> PathResult:
+    """
+    A* з ранньою зупинкою на t; без евристики — звичайна Дейкстра s→t.
+    Стан зберігається у словниках, тож вартість запиту залежить лише від
+    кількості відвіданих вершин, а не від розміру графа.
+    """
+    offsets, targets, weights = (memoryview(g.offsets), memoryview(g.targets),
+                                 memoryview(g.weights))
+    h = heuristic or (lambda v: 0.0)
+    dist = {s: 0.0}
+    pred = {s: -1}
+    closed = set()
+    pq = [(h(s), 0.0, s)]
+    while pq:
+        _, dist_u, u = heapq.heappop(pq)
+        if u in closed:
+            continue
+        closed.add(u)
+        if u == t:
+            return PathResult(dist_u, _walk(pred, t)[::-1], len(closed))
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_dist = dist_u + weights[e]
+            if new_dist < dist.get(v, math.inf):
+                dist[v] = new_dist
+                pred[v] = u
+                heapq.heappush(pq, (new_dist + h(v), new_dist, v))
+    return PathResult(math.inf, [], len(closed))
+
+
+def _bidirectional(g: CSRGraph, s: int, t: int) -> PathResult:
+    """
+    Двонапрямлена Дейкстра: одночасний пошук від s по g і від t по оберненому
+    графу. Кожен крок розширює фронт з меншим мінімальним ключем; пошук
+    зупиняється, коли сума мінімальних ключів обох черг ≥ найкращого μ.
+    """
+    if s == t:
+        return PathResult(0.0, [s], 1)
+    sides = []
+    for graph, root in ((g, s), (g.reverse(), t)):
+        sides.append({
+            'offsets': memoryview(graph.offsets),
+            'targets': memoryview(graph.targets),
+            'weights': memoryview(graph.weights),
+            'dist': {root: 0.0}, 'pred': {root: -1},
+            'closed': set(), 'pq': [(0.0, root)],
+        })
+    mu, meet = math.inf, -1
+    while sides[0]['pq'] and sides[1]['pq']:
+        top_f, top_b = sides[0]['pq'][0][0], sides[1]['pq'][0][0]
+        if top_f + top_b >= mu:
+            break
+        side, other = (sides[0], sides[1]) if top_f <= top_b else (sides[1], sides[0])
+        dist_u, u = heapq.heappop(side['pq'])
+        if u in side['closed']:
+            continue
+        side['closed'].add(u)
+        dist, pred, other_dist = side['dist'], side['pred'], other['dist']
+        targets, weights = side['targets'], side['weights']
+        for e in range(side['offsets'][u], side['offsets'][u + 1]):
+            v = targets[e]
+            new_dist = dist_u + weights[e]
+            if new_dist < dist.get(v, math.inf):
+                dist[v] = new_dist
+                pred[v] = u
+                heapq.heappush(side['pq'], (new_dist, v))
+            if v in other_dist and new_dist + other_dist[v] < mu:
+                mu, meet = new_dist + other_dist[v], v
+    settled = len(sides[0]['closed']) + len(sides[1]['closed'])
+    if meet < 0:
+        return PathResult(math.inf, [], settled)
+    forward = _walk(sides[0]['pred'], meet)[::-1]
+    backward = _walk(sides[1]['pred'], meet)[1:]
+    return PathResult(mu, forward + backward, settled)
+
+
+PATH_METHODS = ('dijkstra', 'bidirectional', 'astar')
+
+
+def shortest_path_csr(g: CSRGraph, s: int, t: int, method: str = 'dijkstra',
+                      heuristic=None) -> PathResult:
+    """
+    Найкоротший шлях s→t за id вершин з ранньою зупинкою.
+    method: 'dijkstra' (зупинка, щойно t оброблена), 'bidirectional' або 'astar'.
+    Для 'astar' heuristic — функція h(v) від id вершини або 'euclidean'
+    (за g.coords); евристика має бути монотонною.
+    """
+    if method == 'dijkstra':
+        return _astar(g, s, t)
+    if method == 'bidirectional':
+        return _bidirectional(g, s, t)
+    if method == 'astar':
+        if heuristic == 'euclidean' or (heuristic is None and g.coords is not None):
+            heuristic = euclidean_heuristic(g, t)
+        return _astar(g, s, t, heuristic)
+    raise ValueError(f"невідомий метод: {method}")
+
+
+def shortest_path(graph: dict, s: str, t: str, method: str = 'dijkstra',
+                  heuristic=None) -> PathResult:
+    """
+    Найкоротший шлях s→t у словнику списків суміжності; шлях повертається
+    іменами вершин. heuristic для 'astar' — функція h(name) від імені вершини.
+    """
+    g = CSRGraph.from_adjacency(graph)
+    h = heuristic
+    if callable(heuristic):
+        names = g.names
+        h = lambda v: heuristic(names[v])
+    res = shortest_path_csr(g, g.ids[s], g.ids[t], method, h)
+    return res._replace(path=[g.names[v] for v in res.path])
+
+
+class ALTIndex:
+    """
+    Індекс ALT (A*, Landmarks, Triangle inequality) для повторних запитів
+    на статичному графі. Для k орієнтирів l зберігаються відстані d(l, v)
+    та d(v, l) до всіх вершин; з нерівності трикутника
+        d(v, t) ≥ max(d(l, t) - d(l, v), d(v, l) - d(t, l)),
+    що дає монотонну евристику для A*.
+
+    Бінарний файл: заголовок ALT_MAGIC, n, k, число ребер (int64), далі
+    landmarks int64[k], from_lm float64[n, k] і to_lm float64[n, k].
+    Рядок вершини суцільний, тож евристика читає k чисел поспіль,
+    а load() відображає файл у пам'ять без копіювання.
+    """
+    def __init__(self, landmarks: np.ndarray, from_lm: np.ndarray, to_lm: np.ndarray,
+                 num_edges: int = -1):
+        self.landmarks = landmarks
+        self.from_lm = from_lm  # from_lm[v, i] = d(landmarks[i], v)
+        self.to_lm = to_lm      # to_lm[v, i] = d(v, landmarks[i])
+        self.num_edges = num_edges
+
+    @classmethod
+    def build(cls, g: CSRGraph, k: int = 16, seed: int = 0) -> 'ALTIndex':
+        """
+        Обирає k орієнтирів методом «найвіддаленішої вершини» і рахує для
+        кожного прямий та обернений прохід Дейкстри.
+        """
+        n = g.num_nodes
+        k = min(k, n)
+        rev = g.reverse()
+        from_lm = np.empty((n, k))
+        to_lm = np.empty((n, k))
+        landmarks = np.empty(k, dtype=np.int64)
+        closest = np.full(n, np.inf)
+        current = int(np.random.default_rng(seed).integers(n))
+        for i in range(k):
+            landmarks[i] = current
+            from_lm[:, i], _ = dijkstra_csr(g, current)
+            to_lm[:, i], _ = dijkstra_csr(rev, current)
+            np.minimum(closest, from_lm[:, i], out=closest)
+            reachable = np.where(np.isfinite(closest), closest, -1.0)
+            current = int(np.argmax(reachable))
+        return cls(landmarks, from_lm, to_lm, g.num_edges)
+
+    def save(self, path: str):
+        n, k = self.from_lm.shape
+        with open(path, 'wb') as f:
+            f.write(ALT_MAGIC)
+            f.write(np.array([n, k, self.num_edges], dtype=np.int64).tobytes())
+            f.write(self.landmarks.astype(np.int64).tobytes())
+            f.write(np.ascontiguousarray(self.from_lm, dtype=np.float64).tobytes())
+            f.write(np.ascontiguousarray(self.to_lm, dtype=np.float64).tobytes())
+
+    @classmethod
+    def load(cls, path: str, g: CSRGraph = None) -> 'ALTIndex':
+        """Відображає файл індексу в пам'ять (np.memmap, лише читання)."""
+        with open(path, 'rb') as f:
+            if f.read(len(ALT_MAGIC)) != ALT_MAGIC:
+                raise ValueError(f"{path}: не є файлом ALT-індексу")
+            n, k, m = np.frombuffer(f.read(24), dtype=np.int64).tolist()
+        if g is not None and (g.num_nodes, g.num_edges) != (n, m):
+            raise ValueError(f"{path}: індекс побудовано для іншого графа")
+        offset = len(ALT_MAGIC) + 24
+        landmarks = np.memmap(path, dtype=np.int64, mode='r', offset=offset, shape=(k,))
+        offset += 8 * k
+        from_lm = np.memmap(path, dtype=np.float64, mode='r', offset=offset, shape=(n, k))
+        offset += 8 * n * k
+        to_lm = np.memmap(path, dtype=np.float64, mode='r', offset=offset, shape=(n, k))
+        return cls(landmarks, from_lm, to_lm, m)
+
+    def heuristic(self, t: int):
+        """Повертає h(v) — нижню оцінку d(v, t) з кешуванням по вершинах."""
+        from_lm, to_lm = self.from_lm, self.to_lm
+        from_t = np.array(from_lm[t])
+        to_t = np.array(to_lm[t])
+        cache = {}
+        fmax = np.fmax.reduce
+
+        def h(v: int) -> float:
+            value = cache.get(v)
+            if value is None:
+                # fmax ігнорує NaN (inf - inf для недосяжних орієнтирів);
+                # 0.0 першим, бо max(0.0, nan) == 0.0
+                with np.errstate(invalid='ignore'):
+                    value = max(0.0, float(fmax(from_t - from_lm[v])),
+                                float(fmax(to_lm[v] - to_t)))
+                cache[v] = value
+            return value
+        return h
+
+    def shortest_path(self, g: CSRGraph, s: int, t: int) -> PathResult:
+        """Запит s→t: A* з ALT-евристикою."""
+        return _astar(g, s, t, self.heuristic(t))
+
+
+ALT_MAGIC = b'ALTIDX01'
+
+
+class ShortestPathTree:
+    """
+    Дерево найкоротших шляхів від source, що підтримується при зміні ваг
+    (динамічний SSSP у стилі Ramalingam–Reps). Граф копіюється з CSRGraph
+    у змінні словники out[u] = {v: w} та inc[v] = {u: w}.
+
+    - Зменшення ваги / нове ребро: якщо ребро скорочує шлях до v, з v
+      запускається локальна Дейкстра, що поширює покращення.
+    - Збільшення ваги / видалення ребра дерева: відстані піддерева v
+      скидаються, кожна його вершина отримує найкращу оцінку через
+      незачеплених вхідних сусідів, і Дейкстра переобробляє лише піддерево.
+
+    Методи оновлення повертають кількість переоброблених вершин.
+    """
+    def __init__(self, g: CSRGraph, source: int):
+        n = g.num_nodes
+        self.source = source
+        self.out = [dict() for _ in range(n)]
+        self.inc = [dict() for _ in range(n)]
+        for u, v, w in zip(g.sources().tolist(), g.targets.tolist(), g.weights.tolist()):
+            if w < self.out[u].get(v, math.inf):
+                self.out[u][v] = w
+                self.inc[v][u] = w
+        self.resettled = 0
+        self.recompute()
+
+    def recompute(self) -> int:
+        """Повний перерахунок з нуля; повертає кількість оброблених вершин."""
+        n = len(self.out)
+        self.dist = [math.inf] * n
+        self.pred = [-1] * n
+        self.dist[self.source] = 0.0
+        return self._propagate([(0.0, self.source)])
+
+    def _propagate(self, pq: list) -> int:
+        """Дейкстра від записів pq, що лише зменшує поточні відстані."""
+        dist, pred, out = self.dist, self.pred, self.out
+        heapq.heapify(pq)
+        settled = 0
+        while pq:
+            dist_u, u = heapq.heappop(pq)
+            if dist_u > dist[u]:
+                continue
+            settled += 1
+            for v, w in out[u].items():
+                new_dist = dist_u + w
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heapq.heappush(pq, (new_dist, v))
+        return settled
+
+    def _subtree(self, root: int) -> list:
+        """Вершини піддерева root у дереві найкоротших шляхів."""
+        pred, out = self.pred, self.out
+        nodes, stack = [root], [root]
+        while stack:
+            x = stack.pop()
+            for y in out[x]:
+                if pred[y] == x:
+                    nodes.append(y)
+                    stack.append(y)
+        return nodes
+
+    def _decrease(self, u: int, v: int) -> int:
+        new_dist = self.dist[u] + self.out[u][v]
+        if new_dist >= self.dist[v]:
+            return 0
+        self.dist[v] = new_dist
+        self.pred[v] = u
+        return self._propagate([(new_dist, v)])
+
+    def _increase(self, v: int) -> int:
+        """Ребро дерева в v погіршилось: переобробляємо піддерево v."""
+        dist, pred, inc = self.dist, self.pred, self.inc
+        affected = self._subtree(v)
+        for x in affected:
+            dist[x] = math.inf
+            pred[x] = -1
+        pq = []
+        for x in affected:
+            for p, w in inc[x].items():
+                if dist[p] + w < dist[x]:
+                    dist[x] = dist[p] + w
+                    pred[x] = p
+            if dist[x] < math.inf:
+                pq.append((dist[x], x))
+        return self._propagate(pq)
+
+    def update_edge(self, u: int, v: int, w: float) -> int:
+        """Встановлює вагу ребра u→v (додає, якщо його немає)."""
+        old = self.out[u].get(v, math.inf)
+        self.out[u][v] = w
+        self.inc[v][u] = w
+        if w < old:
+            count = self._decrease(u, v)
+        elif w > old and self.pred[v] == u:
+            count = self._increase(v)
+        else:
+            count = 0
+        self.resettled += count
+        return count
+
+    def add_edge(self, u: int, v: int, w: float) -> int:
+        return self.update_edge(u, v, w)
+
+    def remove_edge(self, u: int, v: int) -> int:
+        if v not in self.out[u]:
+            return 0
+        del self.out[u][v]
+        del self.inc[v][u]
+        count = self._increase(v) if self.pred[v] == u else 0
+        self.resettled += count
+        return count
+
+    def distances(self) -> np.ndarray:
+        return np.array(self.dist)
+
+    def path(self, v: int) -> list:
+        """Шлях source→v за деревом попередників (порожній, якщо недосяжна)."""
+        if self.dist[v] == math.inf:
+            return []
+        return _walk(self.pred, v)[::-1]
+
+
+def dijkstra(graph: dict, start: str, queue: str = 'heapq') -> dict:
     """
     Реалізує алгоритм Дейкстри з використанням бінарної кучи (heapq).
     Повертає словник найкоротших відстаней від вершини start до всіх інших.
+    Тонкий адаптер: граф перетворюється у CSRGraph, а обчислення виконує dijkstra_csr.
+    Як і початкова реалізація, для цілих ваг повертає цілі відстані
+    (float('inf') для недосяжних вершин).
+    """
+    g = CSRGraph.from_adjacency(graph)
+    dist, _ = dijkstra_csr(g, g.ids[start], queue)
+    dist = dist.tolist()
+    if all(isinstance(w, numbers.Integral) for adj in graph.values() for _, w in adj):
+        dist = [int(d) if d != math.inf else d for d in dist]
+    return dict(zip(g.names, dist))
+
+
+def dijkstra_dict(graph: dict, start: str) -> dict:
+    """
+    Початкова реалізація над словником списків кортежів (str, weight).
+    Залишена як еталон для перевірки та бенчмарків.
     """
     # Ініціалізація відстаней
     distances = {node: float('inf') for node in graph}
@@ -30,6 +1150,235 @@ def dijkstra(graph: dict, start: str) -> dict:
 
     return distances
 
+
+def random_graph(n: int, degree: int, seed: int = 0, max_weight: int = 100) -> CSRGraph:
+    """
+    Синтетичний розріджений граф: кожна вершина має degree вихідних ребер
+    до випадкових вершин з цілими вагами 1..max_weight.
+    """
+    rng = np.random.default_rng(seed)
+    src = np.repeat(np.arange(n), degree)
+    dst = rng.integers(0, n, size=n * degree)
+    w = rng.integers(1, max_weight + 1, size=n * degree).astype(np.float64)
+    return CSRGraph.from_edges(IdNames(n), src, dst, w)
+
+
+def grid_graph(rows: int, cols: int, seed: int = 0, max_weight: int = 10) -> CSRGraph:
+    """
+    Синтетична решітка rows×cols з двонапрямленими ребрами між сусідами
+    по горизонталі та вертикалі. Ваги — цілі 1..max_weight, тобто не менші
+    за евклідову відстань між сусідами; координати вершин зберігаються в coords.
+    """
+    rng = np.random.default_rng(seed)
+    idx = np.arange(rows * cols).reshape(rows, cols)
+    a = np.concatenate([idx[:, :-1].ravel(), idx[:-1, :].ravel()])
+    b = np.concatenate([idx[:, 1:].ravel(), idx[1:, :].ravel()])
+    w = rng.integers(1, max_weight + 1, size=len(a)).astype(np.float64)
+    src = np.concatenate([a, b])
+    dst = np.concatenate([b, a])
+    coords = np.column_stack([(idx % cols).ravel(), (idx // cols).ravel()]).astype(np.float64)
+    names = [f'{r},{c}' for r in range(rows) for c in range(cols)]
+    return CSRGraph.from_edges(names, src, dst, np.concatenate([w, w]), coords)
+
+
+def _timed(fn, *args):
+    """Виконує fn(*args) і повертає (результат, секунди)."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _peak_mb(fn, *args):
+    """Пікова пам'ять (МБ), виділена під час fn(*args), за tracemalloc."""
+    tracemalloc.start()
+    result = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 2**20
+
+
+def benchmark_csr(sizes=(10_000, 100_000, 300_000), degree: int = 8):
+    """
+    Порівнює пам'ять і час: словник списків кортежів + dijkstra_dict
+    проти CSRGraph + dijkstra_csr на синтетичних графах.
+    Час вимірюється окремо від пам'яті, бо tracemalloc сповільнює виконання.
+    """
+    print(f"{'n':>9} {'m':>10} | {'dict МБ':>8} {'dict с':>7} | {'CSR МБ':>8} {'CSR с':>7}")
+    for n in sizes:
+        base = random_graph(n, degree)
+        adj, adj_mb = _peak_mb(base.to_adjacency)
+        _, dict_run_mb = _peak_mb(dijkstra_dict, adj, '0')
+        d_ref, dict_t = _timed(dijkstra_dict, adj, '0')
+        _, csr_run_mb = _peak_mb(dijkstra_csr, base, 0)
+        (dist, _), csr_t = _timed(dijkstra_csr, base, 0)
+        assert np.allclose(dist, [d_ref[name] for name in base.names])
+        csr_mb = base.nbytes() / 2**20
+        print(f"{n:>9} {base.num_edges:>10} | {adj_mb + dict_run_mb:>8.1f} {dict_t:>7.2f}"
+              f" | {csr_mb + csr_run_mb:>8.1f} {csr_t:>7.2f}")
+        del adj
+
+
+def benchmark_queues():
+    """
+    Порівнює черги з пріоритетами з QUEUES на розрідженому, щільному та
+    решітчастому графах: пікова кількість записів у черзі, кількість pop і час.
+    """
+    graphs = {
+        'sparse': random_graph(100_000, 4, seed=1),
+        'dense': random_graph(2_000, 500, seed=2),
+        'grid': grid_graph(300, 300, seed=3),
+    }
+    print(f"{'граф':>7} {'черга':>8} | {'peak':>8} {'pops':>9} {'час, с':>7}")
+    for gname, g in graphs.items():
+        reference = None
+        for qname, cls in QUEUES.items():
+            pq = cls(g.num_nodes, float(g.weights.max()))
+            (dist, _), elapsed = _timed(dijkstra_csr, g, 0, pq)
+            if reference is None:
+                reference = dist
+            assert np.array_equal(dist, reference)
+            print(f"{gname:>7} {qname:>8} | {pq.peak:>8} {pq.pops:>9} {elapsed:>7.2f}")
+
+
+def benchmark_p2p(queries: int = 50):
+    """
+    Запити s→t на решітці 300×300: повна Дейкстра проти ранньої зупинки,
+    двонапрямленого пошуку та A* з евклідовою евристикою.
+    """
+    g = grid_graph(300, 300, seed=4)
+    rng = np.random.default_rng(5)
+    pairs = rng.integers(0, g.num_nodes, size=(queries, 2)).tolist()
+    _, full_t = _timed(lambda: [dijkstra_csr(g, s) for s, _ in pairs[:10]])
+    print(f"{'метод':>14} | {'settled (сер.)':>14} {'мс/запит':>9}")
+    print(f"{'full':>14} | {g.num_nodes:>14} {full_t / 10 * 1000:>9.2f}")
+    reference = None
+    for method in PATH_METHODS:
+        results, elapsed = _timed(lambda: [shortest_path_csr(g, s, t, method) for s, t in pairs])
+        dists = [r.distance for r in results]
+        if reference is None:
+            reference = dists
+        assert np.allclose(dists, reference)
+        settled = sum(r.settled for r in results) / queries
+        print(f"{method:>14} | {settled:>14.0f} {elapsed / queries * 1000:>9.2f}")
+
+
+def benchmark_alt(queries: int = 300, landmarks: int = 16):
+    """
+    Будує ALT-індекс для решітки 300×300, зберігає та відображає його з файлу,
+    перевіряє відповіді проти dijkstra_csr і порівнює латентність запитів
+    (p50/p99) з Дейкстрою з ранньою зупинкою.
+    """
+    g = grid_graph(300, 300, seed=6)
+    index, build_t = _timed(ALTIndex.build, g, landmarks)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'grid.alt')
+        index.save(path)
+        index = ALTIndex.load(path, g)
+        print(f"Індекс: {landmarks} орієнтирів, побудова {build_t:.1f} с, "
+              f"{os.path.getsize(path) / 2**20:.1f} МБ")
+
+        rng = np.random.default_rng(7)
+        pairs = rng.integers(0, g.num_nodes, size=(queries, 2)).tolist()
+        # Перехресна перевірка з повною Дейкстрою на частині запитів
+        for s, t in pairs[:20]:
+            dist, _ = dijkstra_csr(g, s)
+            assert index.shortest_path(g, s, t).distance == dist[t]
+
+        print(f"{'метод':>9} | {'settled':>8} {'p50, мс':>8} {'p99, мс':>8}")
+        for name, query in (('dijkstra', lambda s, t: _astar(g, s, t)),
+                            ('alt', lambda s, t: index.shortest_path(g, s, t))):
+            latencies, settled = [], 0
+            for s, t in pairs:
+                res, elapsed = _timed(query, s, t)
+                latencies.append(elapsed * 1000)
+                settled += res.settled
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"{name:>9} | {settled / queries:>8.0f} {p50:>8.2f} {p99:>8.2f}")
+        del index
+
+
+def benchmark_batch(sources: int = 64):
+    """
+    Матриця відстаней для sources джерел на графі 50 000 вершин:
+    послідовно та на пулі з os.cpu_count() процесів (на одному процесорі
+    порівняння з пулом пропускається); мультиджерельний режим порівнюється
+    з мінімумом по рядках матриці.
+    """
+    g = random_graph(50_000, 6, seed=8)
+    src = np.random.default_rng(9).choice(g.num_nodes, size=sources, replace=False).tolist()
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dist.npy')
+        seq, seq_t = _timed(distance_matrix, g, src, path, 1)
+        reference = np.array(seq)
+        del seq
+        if workers > 1:
+            par, par_t = _timed(distance_matrix, g, src, path, workers)
+            assert np.array_equal(par, reference)
+            del par
+        (nearest, _, origin), multi_t = _timed(dijkstra_multi, g, src)
+        assert np.array_equal(nearest, reference.min(axis=0))
+    print(f"{sources} джерел × {g.num_nodes} вершин")
+    print(f"  послідовно:        {seq_t:.2f} с")
+    if workers > 1:
+        print(f"  пул ({workers} процесів): {par_t:.2f} с")
+    else:
+        print("  пул: пропущено — доступний лише один процесор")
+    print(f"  мультиджерельний прохід (найближче джерело): {multi_t:.2f} с")
+
+
+def benchmark_dynamic(updates: int = 2_000):
+    """
+    Потік випадкових оновлень ваг (збільшення, зменшення, видалення та
+    додавання ребер) на графі 20 000 вершин: ShortestPathTree проти повного
+    перерахунку після кожного оновлення.
+    """
+    g = random_graph(20_000, 5, seed=10)
+    tree = ShortestPathTree(g, 0)
+    rng = np.random.default_rng(11)
+    src, dst = g.sources(), g.targets
+    ops = []
+    for _ in range(updates):
+        kind = rng.integers(4)
+        if kind == 3:
+            ops.append(('add', int(rng.integers(g.num_nodes)), int(rng.integers(g.num_nodes)),
+                        float(rng.integers(1, 101))))
+        else:
+            e = int(rng.integers(g.num_edges))
+            u, v = int(src[e]), int(dst[e])
+            if kind == 2:
+                ops.append(('remove', u, v, None))
+            else:
+                old = tree.out[u].get(v, 50.0)
+                factor = rng.uniform(0.2, 0.9) if kind == 0 else rng.uniform(1.1, 5.0)
+                ops.append(('update', u, v, float(round(old * factor, 3))))
+
+    def incremental():
+        for op, u, v, w in ops:
+            if op == 'remove':
+                tree.remove_edge(u, v)
+            else:
+                tree.update_edge(u, v, w)
+    _, inc_t = _timed(incremental)
+    expected = tree.distances()
+    # Повний перерахунок для порівняння (на вже оновленому графі)
+    full_settled, one_t = _timed(tree.recompute)
+    assert np.array_equal(tree.distances(), expected)
+    print(f"{updates} оновлень на графі {g.num_nodes} вершин / {g.num_edges} ребер")
+    print(f"  інкрементально: {inc_t:.2f} с, переоброблено {tree.resettled / updates:.1f} вершин/оновлення")
+    print(f"  повний перерахунок: ≈{one_t * updates:.2f} с ({full_settled} вершин/оновлення)")
+
+
+BENCHMARKS = {
+    'csr': benchmark_csr,
+    'queues': benchmark_queues,
+    'p2p': benchmark_p2p,
+    'alt': benchmark_alt,
+    'batch': benchmark_batch,
+    'dynamic': benchmark_dynamic,
+}
+
+
 def generate_readme(graph: dict, distances: dict, start: str, path: str = 'README.md'):
     """
     Генерує README.md із описом графа, алгоритму та результатами.
@@ -56,6 +1405,42 @@ def generate_readme(graph: dict, distances: dict, start: str, path: str = 'READM
     with open(path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(lines))
 
+# Більші графи з --graph виводяться підсумком, а не повним списком відстаней
+MAX_PRINTED = 50
+
+
+def format_distance(d: float, integral: bool = True) -> str:
+    """Відстань для виводу: ціле число для цілих ваг, інакше без округлення."""
+    if d == math.inf:
+        return '∞'
+    return f'{d:.0f}' if integral else f'{d:.12g}'
+
+
+def check_fractional_output():
+    """
+    Перевірка CLI: граф із дробовими вагами з CSV має друкувати відстані
+    без округлення до цілих (3.5, а не 4).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'edges.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('u,v,w\nA,B,1.5\nB,C,2\nA,C,4\nC,D,0.25\n')
+        out = io.StringIO()
+        argv = sys.argv
+        sys.argv = ['FP-T3.py', '--graph', path, '--source', 'A']
+        try:
+            with contextlib.redirect_stdout(out):
+                main()
+            sys.argv = ['FP-T3.py', '--graph', path, '--source', 'A', '--target', 'D']
+            with contextlib.redirect_stdout(out):
+                main()
+        finally:
+            sys.argv = argv
+    text = out.getvalue()
+    for line in ('A → B: 1.5', 'A → C: 3.5', 'A → D: 3.75', 'Довжина: 3.75,'):
+        assert line in text, f"у виводі немає «{line}»:\n{text}"
+    print("Вивід дробових відстаней коректний")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Завдання 3: алгоритм Дейкстри з бінарною кучею"
@@ -64,8 +1449,49 @@ def main():
                         help='Початкова вершина (за замовчуванням: A)')
     parser.add_argument('--readme', '-r', default='README.md',
                         help='Шлях до файлу README (за замовчуванням: README.md)')
+    parser.add_argument('--queue', '-q', choices=list(QUEUES), default='heapq',
+                        help='Черга з пріоритетами для Дейкстри (за замовчуванням: heapq)')
+    parser.add_argument('--target', '-t', default=None,
+                        help='Цільова вершина: знайти лише шлях source→target')
+    parser.add_argument('--method', '-m', choices=PATH_METHODS, default='dijkstra',
+                        help='Метод пошуку шляху для --target (за замовчуванням: dijkstra)')
+    parser.add_argument('--build-index', metavar='PATH', default=None,
+                        help='Побудувати ALT-індекс графа і зберегти у файл')
+    parser.add_argument('--landmarks', type=int, default=16,
+                        help='Кількість орієнтирів ALT-індексу (за замовчуванням: 16)')
+    parser.add_argument('--index', metavar='PATH', default=None,
+                        help='ALT-індекс для прискорення запитів --target')
+    parser.add_argument('--graph', '-g', metavar='PATH', default=None,
+                        help='Файл графа: .csv/.tsv/текстовий список ребер, DIMACS .gr або бінарний .bin')
+    parser.add_argument('--undirected', action='store_true',
+                        help='Вважати ребра списку ребер неорієнтованими')
+    parser.add_argument('--header', action='store_const', const=True, default=None,
+                        help='Перший рядок списку ребер — заголовок (без прапорця визначається автоматично)')
+    parser.add_argument('--save-graph', metavar='PATH', default=None,
+                        help='Зберегти граф у бінарному форматі (.bin) для швидкого mmap-завантаження')
+    parser.add_argument('--sources', default=None,
+                        help='Кілька джерел через коми: матриця відстаней (або --nearest)')
+    parser.add_argument('--all-pairs', action='store_true',
+                        help='Матриця відстаней від усіх вершин')
+    parser.add_argument('--nearest', action='store_true',
+                        help='З --sources: відстань до найближчого джерела за один прохід')
+    parser.add_argument('--matrix', metavar='PATH', default='distances.npy',
+                        help='Файл .npy для матриці відстаней (за замовчуванням: distances.npy)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Кількість процесів для пакетного режиму (за замовчуванням: 1)')
+    parser.add_argument('--benchmark', choices=sorted(BENCHMARKS),
+                        help='Запустити бенчмарк замість прикладу')
+    parser.add_argument('--check', action='store_true',
+                        help='Перевірити вивід відстаней для графа з дробовими вагами')
     args = parser.parse_args()
 
+    if args.benchmark:
+        BENCHMARKS[args.benchmark]()
+        return
+    if args.check:
+        check_fractional_output()
+        return
+
     # Визначення графа
     # Неорієнтований зважений граф задається списком суміжності
     graph = {
@@ -77,24 +1503,93 @@ def main():
         'Z': [('D', 6), ('E', 3)]
     }
 
+    if args.graph:
+        g, elapsed = _timed(load_graph, args.graph, args.undirected, args.header)
+        print(f"Граф {args.graph}: {g.num_nodes} вершин, {g.num_edges} ребер "
+              f"(завантажено за {elapsed:.2f} с)")
+    else:
+        g = CSRGraph.from_adjacency(graph)
+    # Цілі ваги друкуються як цілі, дробові — без округлення
+    integral = bool(np.all(g.weights == np.floor(g.weights)))
+
+    if args.save_graph:
+        save_binary(g, args.save_graph)
+        print(f"Бінарний граф збережено у файл: {args.save_graph}")
+        return
+
+    if args.build_index:
+        ALTIndex.build(g, args.landmarks).save(args.build_index)
+        print(f"ALT-індекс збережено у файл: {args.build_index}")
+        return
+
+    if args.sources or args.all_pairs:
+        names = args.sources.split(',') if args.sources else list(g.names)
+        missing = [name for name in names if name not in g.ids]
+        if missing:
+            print(f"Помилка: вершини {', '.join(missing)} не існують в графі.")
+            return
+        ids = [g.ids[name] for name in names]
+        if args.nearest:
+            dist, _, origin = dijkstra_multi(g, ids)
+            if g.num_nodes > MAX_PRINTED:
+                reachable = np.isfinite(dist)
+                print(f"Досяжно вершин: {int(reachable.sum())} з {g.num_nodes}, "
+                      f"максимальна відстань до найближчого джерела: "
+                      f"{format_distance(dist[reachable].max(), integral)}")
+                return
+            print("Відстань до найближчого джерела:")
+            for v, name in enumerate(g.names):
+                d = dist[v]
+                near = g.names[origin[v]] if origin[v] >= 0 else '—'
+                print(f"  {name}: {format_distance(d, integral)} (джерело {near})")
+            return
+        _, elapsed = _timed(distance_matrix, g, ids, args.matrix, args.workers)
+        print(f"Матрицю відстаней {len(ids)} × {g.num_nodes} збережено у файл: "
+              f"{args.matrix} ({elapsed:.2f} с)")
+        return
+
     start = args.source
-    if start not in graph:
+    if start not in g.ids:
         print(f"Помилка: вершина '{start}' не існує в графі.")
         return
 
+    if args.target is not None:
+        if args.target not in g.ids:
+            print(f"Помилка: вершина '{args.target}' не існує в графі.")
+            return
+        s_id, t_id = g.ids[start], g.ids[args.target]
+        if args.index:
+            res = ALTIndex.load(args.index, g).shortest_path(g, s_id, t_id)
+        else:
+            res = shortest_path_csr(g, s_id, t_id, args.method)
+        if not res.path:
+            print(f"Шляху {start} → {args.target} не існує (settled: {res.settled}).")
+            return
+        path = [g.names[v] for v in res.path]
+        print(f"Найкоротший шлях {start} → {args.target}: {' → '.join(path)}")
+        print(f"  Довжина: {format_distance(res.distance, integral)}, "
+              f"оброблено вершин: {res.settled}")
+        return
+
     # Обчислення найкоротших відстаней
-    distances = dijkstra(graph, start)
+    dist, _ = dijkstra_csr(g, g.ids[start], args.queue)
+
+    if args.graph and g.num_nodes > MAX_PRINTED:
+        reachable = np.isfinite(dist)
+        print(f"Досяжно вершин з {start}: {int(reachable.sum())} з {g.num_nodes}, "
+              f"максимальна відстань: {format_distance(dist[reachable].max(), integral)}")
+        return
+    distances = dict(zip(g.names, dist.tolist()))
 
     # Вивід у термінал
     print(f"Найкоротші відстані від вершини {start}:")
     for node in sorted(distances):
-        d = distances[node]
-        dist_str = f"{d:.0f}" if d < float('inf') else '∞'
-        print(f"  {start} → {node}: {dist_str}")
+        print(f"  {start} → {node}: {format_distance(distances[node], integral)}")
 
-    # Генерація README.md
-    generate_readme(graph, distances, start, path=args.readme)
-    print(f"\nREADME збережено у файл: {args.readme}")
+    # Генерація README.md (лише для прикладу з умови задачі)
+    if not args.graph:
+        generate_readme(graph, distances, start, path=args.readme)
+        print(f"\nREADME збережено у файл: {args.readme}")
 
 if __name__ == '__main__':
     main()
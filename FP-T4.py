@@ -1,52 +1,354 @@
 #!/usr/bin/env python3
 import argparse
-import networkx as nx
+import heapq
+import time
 import matplotlib.pyplot as plt
+import numpy as np
+from array import array
+from matplotlib.collections import LineCollection
 import os
 
+# До цієї кількості вузлів купа малюється як раніше: кола з підписами
+LABEL_LIMIT = 31
+
+# Скільки верхніх рівнів малюється вузлами; глибші рівні агрегуються
+MAX_DRAWN_LEVELS = 14
+
+# Кількість стовпців агрегованої смуги для кожного глибокого рівня
+AGGREGATE_BINS = 1024
+
+
+def _heap_view(a, typecode):
+    """NumPy-вигляд на буфер array без копіювання."""
+    return np.frombuffer(a, dtype=np.int64 if typecode == 'q' else np.float64)
+
+
+def heapify_array(h, arity=2):
+    """
+    Перетворює NumPy-масив h на d-арну мін-купу на місці за O(n).
+    Знизу вгору, рівень за рівнем: піддерева вузлів одного рівня не
+    перетинаються, тож просіювання вниз усіх вузлів рівня виконується
+    одночасно векторними операціями — по кроку на кожен рівень спуску.
+    """
+    n = len(h)
+    if n < 2:
+        return h
+    last_parent = (n - 2) // arity
+    starts = [0]
+    while starts[-1] <= last_parent:
+        starts.append(starts[-1] * arity + 1)
+    offsets = np.arange(1, arity + 1)
+    for k in reversed(range(len(starts) - 1)):
+        nodes = np.arange(starts[k], min(starts[k + 1], last_parent + 1))
+        while len(nodes):
+            idx = nodes[:, None] * arity + offsets
+            vals = h[np.minimum(idx, n - 1)]
+            # Відсутні діти підміняються значенням батька, щоб не бути меншими
+            vals = np.where(idx < n, vals, h[nodes][:, None])
+            best = vals.argmin(axis=1)
+            child = idx[np.arange(len(nodes)), best]
+            swap = vals[np.arange(len(nodes)), best] < h[nodes]
+            nodes, child = nodes[swap], child[swap]
+            h[nodes], h[child] = h[child], h[nodes]
+            nodes = child[child <= last_parent]
+    return h
+
+
+def heap_violations(values, arity=2, max_heap=False):
+    """
+    Індекси вузлів, що порушують властивість купи щодо свого батька:
+    value[i] < value[parent] для мін-купи (> для макс-купи).
+    """
+    v = np.asarray(values)
+    if len(v) < 2:
+        return np.empty(0, dtype=np.int64)
+    children = np.arange(1, len(v))
+    parents = v[(children - 1) // arity]
+    bad = v[children] > parents if max_heap else v[children] < parents
+    return children[bad]
+
+
+class DaryHeap:
+    """
+    d-арна купа над пласким array: діти вузла i — d·i + 1 … d·i + d.
+    Більша арність зменшує висоту й кількість переходів між рядками кешу
+    під час pop ціною порівняння d дітей на кожному рівні.
+    Макс-купа зберігає значення зі зміненим знаком і працює як мін-купа.
+    """
+
+    __slots__ = ('_a', 'arity', 'typecode', '_sign')
+
+    def __init__(self, data=(), arity=2, max_heap=False, typecode='q'):
+        if arity < 2:
+            raise ValueError("Арність купи має бути не меншою за 2")
+        self.arity = arity
+        self.typecode = typecode
+        self._sign = -1 if max_heap else 1
+        dtype = np.int64 if typecode == 'q' else np.float64
+        values = np.asarray(data, dtype=dtype) * self._sign
+        self._a = array(typecode)
+        self._a.frombytes(values.tobytes())
+        heapify_array(_heap_view(self._a, typecode), arity)
+
+    @property
+    def max_heap(self):
+        return self._sign < 0
+
+    def __len__(self):
+        return len(self._a)
+
+    def __iter__(self):
+        """Значення в порядку масиву купи (рівень за рівнем)."""
+        s = self._sign
+        return (s * v for v in self._a)
+
+    def to_numpy(self):
+        return _heap_view(self._a, self.typecode) * self._sign
+
+    def peek(self):
+        if not self._a:
+            raise IndexError("peek from empty heap")
+        return self._sign * self._a[0]
+
+    def push(self, value):
+        a = self._a
+        a.append(self._sign * value)
+        self._sift_up(len(a) - 1)
+
+    def pop(self):
+        """Видаляє й повертає вершину купи."""
+        a = self._a
+        if not a:
+            raise IndexError("pop from empty heap")
+        last = a.pop()
+        if not a:
+            return self._sign * last
+        top = a[0]
+        a[0] = last
+        self._sift_down(0)
+        return self._sign * top
+
+    def replace(self, value):
+        """Повертає вершину й вставляє value за одне просіювання (як heapq.heapreplace)."""
+        a = self._a
+        if not a:
+            raise IndexError("replace on empty heap")
+        top = a[0]
+        a[0] = self._sign * value
+        self._sift_down(0)
+        return self._sign * top
+
+    def violations(self):
+        """Індекси вузлів, що порушують властивість купи."""
+        return heap_violations(_heap_view(self._a, self.typecode), self.arity)
+
+    def is_valid(self):
+        return len(self.violations()) == 0
+
+    def _sift_up(self, pos):
+        a, d = self._a, self.arity
+        item = a[pos]
+        while pos > 0:
+            parent = (pos - 1) // d
+            p = a[parent]
+            if p <= item:
+                break
+            a[pos] = p
+            pos = parent
+        a[pos] = item
+
+    def _sift_down(self, pos):
+        # Метод «дірки»: елемент записується один раз у кінцеву позицію
+        a, d, n = self._a, self.arity, len(self._a)
+        item = a[pos]
+        while True:
+            first = d * pos + 1
+            if first >= n:
+                break
+            block = a[first:first + d]
+            m = min(block)
+            if m >= item:
+                break
+            a[pos] = m
+            pos = first + block.index(m)
+        a[pos] = item
+
+
+def benchmark(n=10**7, ops=200_000, arities=(2, 4, 8), seed=0):
+    """
+    heapify для n елементів і пропускна здатність ops операцій push, потім
+    ops операцій pop на купі такого розміру: heapq проти DaryHeap.
+    """
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 1 << 62, size=n)
+    pushes = rng.integers(0, 1 << 62, size=ops).tolist()
+    rows = []
+
+    lst = data.tolist()
+    t = time.perf_counter()
+    heapq.heapify(lst)
+    t_build = time.perf_counter() - t
+    t = time.perf_counter()
+    for v in pushes:
+        heapq.heappush(lst, v)
+    t_push = time.perf_counter() - t
+    t = time.perf_counter()
+    for _ in range(ops):
+        heapq.heappop(lst)
+    t_pop = time.perf_counter() - t
+    rows.append(('heapq', t_build, t_push, t_pop))
+    del lst
+
+    for d in arities:
+        t = time.perf_counter()
+        h = DaryHeap(data, arity=d)
+        t_build = time.perf_counter() - t
+        push, pop = h.push, h.pop
+        t = time.perf_counter()
+        for v in pushes:
+            push(v)
+        t_push = time.perf_counter() - t
+        t = time.perf_counter()
+        for _ in range(ops):
+            pop()
+        t_pop = time.perf_counter() - t
+        rows.append((f"DaryHeap d={d}", t_build, t_push, t_pop))
+        del h
+
+    print(f"n = {n}, ops = {ops}")
+    print(f"{'Варіант':<16}{'heapify, с':>12}{'push, оп/с':>14}{'pop, оп/с':>14}")
+    for name, t_build, t_push, t_pop in rows:
+        print(f"{name:<16}{t_build:>12.3f}{ops / t_push:>14,.0f}{ops / t_pop:>14,.0f}")
+    return rows
+
+
+def heap_levels(n):
+    """Номер рівня кожного індексу неявної купи: ⌊log2(i + 1)⌋."""
+    return np.frexp(np.arange(1, n + 1, dtype=np.float64))[1] - 1
+
+
+def heap_positions(n):
+    """
+    Координати вузлів неявної купи в замкненій формі: вузол i на рівні k
+    зі зсувом j = i + 1 - 2^k має x = (2j + 1) / 2^k - 1 і y = -k.
+    Це ті самі позиції, що давав рекурсивний обхід з кроком ±1/2^k.
+    """
+    levels = heap_levels(n)
+    width = np.ldexp(1.0, levels)
+    offsets = np.arange(1, n + 1) - width
+    return np.column_stack([(2 * offsets + 1) / width - 1, -levels.astype(np.float64)])
+
+
+def heap_edges(pos):
+    """Відрізки батько → дитина (n - 1, 2, 2); батько вузла i — (i - 1) // 2."""
+    n = len(pos)
+    children = np.arange(1, n)
+    return np.stack([pos[(children - 1) // 2], pos[children]], axis=1)
+
+
 def build_heap_graph(heap):
+    """
+    networkx.DiGraph купи з позиціями вузлів — для сумісності з кодом, що
+    працює з графом. Будується без рекурсії з heap_positions.
+    """
+    import networkx as nx
+
+    n = len(heap)
     G = nx.DiGraph()
-    pos = {}
-    def _add(i, x, y, layer):
-        if i >= len(heap):
-            return
-        G.add_node(i, label=str(heap[i]))
-        pos[i] = (x, y)
-        left, right = 2*i + 1, 2*i + 2
-        if left < len(heap):
-            G.add_edge(i, left)
-            _add(left, x - 1/2**layer, y - 1, layer + 1)
-        if right < len(heap):
-            G.add_edge(i, right)
-            _add(right, x + 1/2**layer, y - 1, layer + 1)
-    _add(0, 0.0, 0.0, 1)
+    G.add_nodes_from((i, {'label': str(v)}) for i, v in enumerate(heap))
+    G.add_edges_from(((i - 1) // 2, i) for i in range(1, n))
+    pos = {i: (float(x), float(y)) for i, (x, y) in enumerate(heap_positions(n))}
     return G, pos
 
-def visualize_heap(heap, output):
-    print("1) Building heap graph from:", heap)
-    G, pos = build_heap_graph(heap)
 
-    labels = nx.get_node_attributes(G, 'label')
+def _aggregate_levels(values, first, last, bins):
+    """
+    Середнє значення купи в bins рівних за x відрізках для кожного з рівнів
+    first..last - 1: матриця (last - first, bins), NaN там, де вузлів немає.
+    """
+    n = len(values)
+    grid = np.full((last - first, bins), np.nan)
+    for row, k in enumerate(range(first, last)):
+        lo, hi = (1 << k) - 1, min((1 << (k + 1)) - 1, n)
+        if lo >= hi:
+            break
+        # Вузли рівня рівномірно вкривають [-1, 1], тож відрізок — зсув · bins / 2^k
+        cols = (np.arange(hi - lo) * bins) >> k
+        counts = np.bincount(cols, minlength=bins)
+        sums = np.bincount(cols, weights=values[lo:hi], minlength=bins)
+        with np.errstate(invalid='ignore'):
+            grid[row] = sums / counts
+    return grid
+
+
+def draw_heap(ax, heap, max_levels=MAX_DRAWN_LEVELS, violations=None):
+    """
+    Малює купу напряму через LineCollection і scatter. Малі купи — кола з
+    підписами, більші — точки з кольором за значенням. Якщо рівнів більше
+    за max_levels, глибші рівні агрегуються у смуги середніх значень.
+    violations — індекси вузлів, що порушують властивість купи: вони та
+    ребра до їхніх батьків виділяються червоним.
+    """
+    values = np.asarray(heap, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return
+    height = int(heap_levels(n)[-1]) + 1
+    drawn = n if height <= max_levels else (1 << max_levels) - 1
+    pos = heap_positions(drawn)
+    bad = np.zeros(drawn, dtype=bool)
+    if violations is not None:
+        v = np.asarray(violations, dtype=np.int64)
+        bad[v[v < drawn]] = True
+
+    if n <= LABEL_LIMIT:
+        ax.add_collection(LineCollection(heap_edges(pos), zorder=1,
+                                         colors=np.where(bad[1:], 'red', '#555555')))
+        ax.scatter(pos[:, 0], pos[:, 1], s=1500, c=np.where(bad, 'salmon', 'skyblue'), zorder=2)
+        for (x, y), v in zip(pos, heap):
+            ax.text(x, y, str(v), ha='center', va='center', fontweight='bold', zorder=3)
+        ax.margins(0.1)
+        return
+
+    vmin, vmax = values.min(), values.max()
+    # На тисячах вузлів тонкі лінії; далі ребра лише заважають
+    if drawn <= 4095:
+        ax.add_collection(LineCollection(heap_edges(pos), colors='#555555',
+                                         linewidths=0.3, zorder=1))
+    # Розмір точки спадає з рівнем: на рівні k вузли стоять з кроком 2 / 2^k
+    size = np.clip(4000.0 / np.ldexp(1.0, heap_levels(drawn)), 0.5, 200.0)
+    points = ax.scatter(pos[:, 0], pos[:, 1], s=size, c=values[:drawn], cmap='viridis',
+                        vmin=vmin, vmax=vmax, linewidths=0, zorder=2)
+    if bad.any():
+        ax.scatter(pos[bad, 0], pos[bad, 1], s=np.maximum(size[bad], 20), facecolors='none',
+                   edgecolors='red', linewidths=0.8, zorder=3)
+    if drawn < n:
+        grid = _aggregate_levels(values, max_levels, height, AGGREGATE_BINS)
+        ax.imshow(grid, cmap='viridis', vmin=vmin, vmax=vmax, aspect='auto',
+                  interpolation='nearest', origin='upper',
+                  extent=(-1, 1, -height + 0.5, -max_levels + 0.5))
+        ax.axhline(-max_levels + 0.5, color='#555555', linewidth=0.5)
+    ax.set_xlim(-1.02, 1.02)
+    ax.set_ylim(-height + 0.3, 0.5)
+    plt.colorbar(points, ax=ax, fraction=0.03, pad=0.02)
+
+
+def visualize_heap(heap, output, max_levels=MAX_DRAWN_LEVELS, violations=None):
+    if len(heap) <= LABEL_LIMIT:
+        print("1) Building heap layout from:", heap)
+    else:
+        print(f"1) Building heap layout for {len(heap)} elements")
     print("2) Rendering and saving visualization to:", output)
-    plt.figure(figsize=(8, 6))
-    nx.draw(
-        G, pos,
-        labels=labels,
-        with_labels=True,
-        arrows=False,
-        node_size=1500,
-        node_color='skyblue',
-        edge_color='#555555',
-        font_weight='bold'
-    )
-    plt.axis('off')
-    plt.tight_layout()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    draw_heap(ax, heap, max_levels, violations)
+    ax.axis('off')
+    fig.tight_layout()
 
     # Створюємо теку, якщо потрібно
     os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
 
-    plt.savefig(output, dpi=300)
-    plt.close()
+    fig.savefig(output, dpi=300)
+    plt.close(fig)
     print(f"3) Done! File available at: {output}")
 
 def parse_args():
@@ -63,18 +365,91 @@ def parse_args():
         default='heap.png',
         help="Файл для збереження зображення (PNG). За замовчуванням: heap.png"
     )
+    parser.add_argument(
+        '--random', '-n',
+        type=int,
+        help="Замість --heap згенерувати купу з N випадкових цілих"
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help="Зерно генератора для --random. За замовчуванням: 0"
+    )
+    parser.add_argument(
+        '--max-levels',
+        type=int,
+        default=MAX_DRAWN_LEVELS,
+        help=f"Скільки верхніх рівнів малювати вузлами; глибші агрегуються. "
+             f"За замовчуванням: {MAX_DRAWN_LEVELS}"
+    )
+    parser.add_argument(
+        '--kind',
+        choices=('max', 'min'),
+        default='max',
+        help="Тип купи для --heapify і --highlight. За замовчуванням: max"
+    )
+    parser.add_argument(
+        '--heapify',
+        action='store_true',
+        help="Перед малюванням перетворити вхідні дані на купу за O(n)"
+    )
+    parser.add_argument(
+        '--highlight',
+        action='store_true',
+        help="Виділити червоним вузли, що порушують властивість купи"
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help="Порівняти heapq і d-арні купи (2, 4, 8) замість малювання"
+    )
+    parser.add_argument(
+        '--bench-size',
+        type=int,
+        default=10**7,
+        help="Розмір купи для --benchmark. За замовчуванням: 10^7"
+    )
+    parser.add_argument(
+        '--bench-ops',
+        type=int,
+        default=200_000,
+        help="Кількість push і pop для --benchmark. За замовчуванням: 200000"
+    )
     return parser.parse_args()
 
 def main():
     args = parse_args()
-    # Розбираємо рядок у список цілих
-    try:
-        heap = [int(x.strip()) for x in args.heap.split(',') if x.strip()!='']
-    except ValueError:
-        print("Error: всі елементи heap повинні бути цілими числами, розділеними комами.")
+    if args.benchmark:
+        benchmark(args.bench_size, args.bench_ops, seed=args.seed)
         return
 
-    visualize_heap(heap, args.output)
+    max_heap = args.kind == 'max'
+    if args.random is not None:
+        rng = np.random.default_rng(args.seed)
+        heap = rng.integers(0, 10 * max(args.random, 1), size=args.random)
+        if not args.heapify:
+            # Відсортований масив — уже коректна купа потрібного типу
+            heap = np.sort(heap)[::-1] if max_heap else np.sort(heap)
+    else:
+        # Розбираємо рядок у список цілих
+        try:
+            heap = [int(x.strip()) for x in args.heap.split(',') if x.strip()!='']
+        except ValueError:
+            print("Error: всі елементи heap повинні бути цілими числами, розділеними комами.")
+            return
+
+    if args.heapify:
+        heap = DaryHeap(heap, max_heap=max_heap).to_numpy()
+        if args.random is None:
+            heap = heap.tolist()
+
+    violations = None
+    if args.highlight:
+        violations = heap_violations(heap, max_heap=max_heap)
+        print(f"Порушень властивості {args.kind}-купи: {len(violations)}")
+
+    visualize_heap(heap, args.output, args.max_levels, violations)
 
 if __name__ == '__main__':
     main()
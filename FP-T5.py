@@ -1,86 +1,208 @@
 #!/usr/bin/env python3
 import argparse
-import networkx as nx
+import time
 import matplotlib.pyplot as plt
-from collections import deque
+import numpy as np
+from matplotlib.collections import LineCollection
 import os
 
-def build_heap_graph(heap):
-    G = nx.DiGraph()
-    pos = {}
-    def _add(i, x, y, layer):
-        if i >= len(heap):
-            return
-        G.add_node(i, label=str(heap[i]))
-        pos[i] = (x, y)
-        left, right = 2*i + 1, 2*i + 2
-        if left < len(heap):
-            G.add_edge(i, left)
-            _add(left, x - 1/2**layer, y - 1, layer + 1)
-        if right < len(heap):
-            G.add_edge(i, right)
-            _add(right, x + 1/2**layer, y - 1, layer + 1)
-    _add(0, 0.0, 0.0, 1)
-    return G, pos
-
-def get_color_list(base_hex, n):
-    base_rgb = tuple(int(base_hex[i:i+2],16) for i in (1,3,5))
-    colors = []
-    for idx in range(n):
-        t = idx/(n-1) if n>1 else 0
-        r = int(base_rgb[0]*(1-t) + 255*t)
-        g = int(base_rgb[1]*(1-t) + 255*t)
-        b = int(base_rgb[2]*(1-t) + 255*t)
-        colors.append(f'#{r:02X}{g:02X}{b:02X}')
-    return colors
-
-def bfs_order(G, start=0):
-    visited = {start}
-    order = [start]
-    queue = deque([start])
-    while queue:
-        u = queue.popleft()
-        for v in G.successors(u):
-            if v not in visited:
-                visited.add(v)
-                order.append(v)
-                queue.append(v)
-    return order
-
-def dfs_order(G, start=0):
-    visited = {start}
-    order = [start]
-    stack = [start]
+# До цієї кількості вузлів дерево малюється колами з підписами
+LABEL_LIMIT = 31
+
+# Скільки верхніх рівнів малюється; обхід і кольори рахуються для всіх вузлів
+MAX_DRAWN_LEVELS = 14
+
+# Скільки значень обходу виписується в README
+MAX_LISTED = 100
+
+# Варіанти обходу в глибину
+DFS_ORDERS = ('pre', 'in', 'post')
+
+
+def level_bounds(n):
+    """Межі рівнів неявної купи: рівень k — індекси [2^k - 1, min(2^(k+1) - 1, n))."""
+    lo = 0
+    while lo < n:
+        hi = min(2 * lo + 1, n)
+        yield lo, hi
+        lo = hi
+
+
+def bfs_levels(n):
+    """
+    Лінивий BFS неявної купи: рівні видаються як NumPy-відрізки індексів.
+    У масиві купи обхід у ширину збігається з порядком індексів.
+    """
+    for lo, hi in level_bounds(n):
+        yield np.arange(lo, hi)
+
+
+def iter_dfs(n, order='pre'):
+    """
+    Лінивий обхід у глибину неявної купи (діти i — 2i + 1 і 2i + 2) з явним
+    стеком висоти O(log n): order — 'pre', 'in' або 'post'.
+    """
+    if order not in DFS_ORDERS:
+        raise ValueError(f"Невідомий порядок обходу: {order}")
+    stack = [(0, False)] if n else []
     while stack:
-        u = stack.pop()
-        for v in reversed(list(G.successors(u))):
-            if v not in visited:
-                visited.add(v)
-                order.append(v)
-                stack.append(v)
-    return order
-
-def draw_and_save(G, pos, labels, color_map, output_file):
-    plt.figure(figsize=(8,6))
-    nx.draw(G, pos, labels=labels, with_labels=True,
-            arrows=False, node_size=1500,
-            node_color=color_map, edge_color='#555555',
-            font_weight='bold')
-    plt.axis('off')
-    plt.tight_layout()
+        i, ready = stack.pop()
+        if ready:
+            yield i
+            continue
+        l, r = 2 * i + 1, 2 * i + 2
+        left = [(l, False)] if l < n else []
+        right = [(r, False)] if r < n else []
+        if order == 'pre':
+            visit = [(i, True)] + left + right
+        elif order == 'in':
+            visit = left + [(i, True)] + right
+        else:
+            visit = left + right + [(i, True)]
+        stack.extend(reversed(visit))
+
+
+def subtree_sizes(n):
+    """Розміри піддерев усіх вузлів знизу вгору — по одній векторній операції на рівень."""
+    size = np.ones(n, dtype=np.int64)
+    bounds = list(level_bounds(n))
+    for (plo, phi), (clo, chi) in zip(reversed(bounds[:-1]), reversed(bounds[1:])):
+        parents = (np.arange(clo, chi) - 1) // 2 - plo
+        size[plo:phi] += np.bincount(parents, weights=size[clo:chi],
+                                     minlength=phi - plo).astype(np.int64)
+    return size
+
+
+def dfs_ranks(n, order='pre'):
+    """
+    Позиція кожного вузла в обході order за O(n) без стека: піддерево вузла
+    займає суцільний блок [start, start + size) порядку, тож старти дітей
+    і ранг самого вузла рахуються зверху вниз векторно для цілого рівня.
+    """
+    if order not in DFS_ORDERS:
+        raise ValueError(f"Невідомий порядок обходу: {order}")
+    size = subtree_sizes(n)
+    start = np.zeros(n, dtype=np.int64)
+    rank = np.empty(n, dtype=np.int64)
+    for lo, hi in level_bounds(n):
+        idx = np.arange(lo, hi)
+        l = 2 * idx + 1
+        has_l, has_r = l < n, l + 1 < n
+        lsz = np.where(has_l, size[np.minimum(l, n - 1)], 0)
+        s = start[lo:hi]
+        if order == 'pre':
+            rank[lo:hi] = s
+            start[l[has_l]] = s[has_l] + 1
+            start[l[has_r] + 1] = s[has_r] + 1 + lsz[has_r]
+        elif order == 'in':
+            rank[lo:hi] = s + lsz
+            start[l[has_l]] = s[has_l]
+            start[l[has_r] + 1] = s[has_r] + lsz[has_r] + 1
+        else:
+            rank[lo:hi] = s + size[lo:hi] - 1
+            start[l[has_l]] = s[has_l]
+            start[l[has_r] + 1] = s[has_r] + lsz[has_r]
+    return rank
+
+
+def inverse_permutation(perm):
+    """inv[perm[k]] = k за O(n)."""
+    inv = np.empty_like(perm)
+    inv[perm] = np.arange(len(perm), dtype=perm.dtype)
+    return inv
+
+
+def bfs_order(n):
+    """Індекси вузлів у порядку BFS (масив NumPy)."""
+    return np.arange(n)
+
+
+def dfs_order(n, order='pre'):
+    """Індекси вузлів у порядку обходу в глибину (масив NumPy)."""
+    return inverse_permutation(dfs_ranks(n, order))
+
+
+def traverse(n, order='bfs', chunk=1 << 16):
+    """
+    Лінивий обхід порціями індексів: 'bfs' — по рівнях, 'pre' / 'in' / 'post' —
+    відрізки довжини chunk перестановки dfs_order.
+    """
+    if order == 'bfs':
+        yield from bfs_levels(n)
+        return
+    perm = dfs_order(n, order)
+    for a in range(0, n, chunk):
+        yield perm[a:a + chunk]
+
+
+def rank_colors(rank, base_hex):
+    """
+    Кольори вузлів RGB (n, 3) у [0, 1] за їхнім рангом в обході: градація від
+    base_hex (перший відвіданий) до білого (останній); компоненти
+    округлюються вниз до цілих 0..255.
+    """
+    n = len(rank)
+    base = np.array([int(base_hex[i:i+2], 16) for i in (1, 3, 5)], dtype=np.float64)
+    t = rank / (n - 1) if n > 1 else np.zeros(n)
+    rgb = (base * (1 - t[:, None]) + 255 * t[:, None]).astype(np.int64)
+    return rgb / 255.0
+
+
+def heap_positions(n):
+    """Координати вузлів: вузол i на рівні k зі зсувом j має x = (2j + 1) / 2^k - 1, y = -k."""
+    levels = np.frexp(np.arange(1, n + 1, dtype=np.float64))[1] - 1
+    width = np.ldexp(1.0, levels)
+    offsets = np.arange(1, n + 1) - width
+    return np.column_stack([(2 * offsets + 1) / width - 1, -levels.astype(np.float64)])
+
+
+def draw_and_save(heap, colors, output_file):
+    """
+    Малює дерево купи через LineCollection і scatter без networkx; для
+    великих куп — лише верхні MAX_DRAWN_LEVELS рівнів, без підписів.
+    """
+    n = min(len(heap), (1 << MAX_DRAWN_LEVELS) - 1)
+    pos = heap_positions(n)
+    children = np.arange(1, n)
+    edges = np.stack([pos[(children - 1) // 2], pos[children]], axis=1)
+
+    fig, ax = plt.subplots(figsize=(8,6))
+    if n <= LABEL_LIMIT:
+        ax.add_collection(LineCollection(edges, colors='#555555', zorder=1))
+        ax.scatter(pos[:, 0], pos[:, 1], s=1500, c=colors[:n], zorder=2)
+        for (x, y), v in zip(pos, heap):
+            ax.text(x, y, str(v), ha='center', va='center', fontweight='bold', zorder=3)
+        ax.margins(0.1)
+    else:
+        if n <= 4095:
+            ax.add_collection(LineCollection(edges, colors='#555555', linewidths=0.3, zorder=1))
+        size = np.clip(4000.0 / np.ldexp(1.0, -pos[:, 1].astype(np.int64)), 0.5, 200.0)
+        ax.scatter(pos[:, 0], pos[:, 1], s=size, c=colors[:n], linewidths=0, zorder=2)
+        ax.set_xlim(-1.02, 1.02)
+        ax.set_ylim(pos[-1, 1] - 0.5, 0.5)
+    ax.axis('off')
+    fig.tight_layout()
     os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
-    plt.savefig(output_file, dpi=300)
-    plt.close()
+    fig.savefig(output_file, dpi=300)
+    plt.close(fig)
+
+def _listed(values):
+    """Значення для README; довгі обходи обрізаються до MAX_LISTED."""
+    text = ' '.join(str(v) for v in np.asarray(values[:MAX_LISTED]).tolist())
+    if len(values) > MAX_LISTED:
+        text += f' … (усього {len(values)})'
+    return text
 
 def generate_readme(heap, bfs_vals, dfs_vals, bfs_img, dfs_img, readme_path):
+    heap_text = np.asarray(heap).tolist() if len(heap) <= MAX_LISTED else f'{len(heap)} елементів'
     lines = [
         '# Завдання 5. Візуалізація обходу бінарного дерева\n',
         '## Вхідні дані\n',
-        f'- Купа (масив): {heap}\n',
+        f'- Купа (масив): {heap_text}\n',
         '## Порядок обходу BFS\n',
-        ' '.join(str(v) for v in bfs_vals) + '\n',
+        _listed(bfs_vals) + '\n',
         '## Порядок обходу DFS\n',
-        ' '.join(str(v) for v in dfs_vals) + '\n',
+        _listed(dfs_vals) + '\n',
         '## Візуалізації\n',
         f'![BFS]({bfs_img})\n',
         f'![DFS]({dfs_img})\n',
@@ -98,6 +220,12 @@ def main():
     parser.add_argument('--heap', '-H',
                         default="10,5,3,2,4,1",
                         help="(Опційно) Елементи купи через коми, напр.: 10,5,3,2,4,1")
+    parser.add_argument('--random', '-n', type=int,
+                        help="Замість --heap узяти купу з N випадкових цілих")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Зерно генератора для --random (default: 0)")
+    parser.add_argument('--order', choices=DFS_ORDERS, default='pre',
+                        help="Варіант обходу в глибину: pre, in або post (default: pre)")
     parser.add_argument('--prefix', '-p',
                         default='heap',
                         help="Префікс для вихідних файлів (default: heap)")
@@ -106,37 +234,40 @@ def main():
                         help="Шлях до README (default: README.md)")
     args = parser.parse_args()
 
-    # Розбираємо рядок у список цілих
-    heap = [int(x) for x in args.heap.split(',') if x.strip()]
-
-    # Будуємо граф та позиції
-    G, pos = build_heap_graph(heap)
-    labels = nx.get_node_attributes(G, 'label')
+    if args.random is not None:
+        # Відсортований масив — коректна мін-купа
+        rng = np.random.default_rng(args.seed)
+        heap = np.sort(rng.integers(0, 10 * max(args.random, 1), size=args.random))
+    else:
+        # Розбираємо рядок у список цілих
+        heap = [int(x) for x in args.heap.split(',') if x.strip()]
+    n = len(heap)
+    values = np.asarray(heap)
 
     # Обчислюємо порядки обходу і мапимо на значення
-    bfs_idx = bfs_order(G)
-    dfs_idx = dfs_order(G)
-    bfs_vals = [heap[i] for i in bfs_idx]
-    dfs_vals = [heap[i] for i in dfs_idx]
+    t = time.perf_counter()
+    bfs_idx = bfs_order(n)
+    dfs_idx = dfs_order(n, args.order)
+    bfs_vals = values[bfs_idx]
+    dfs_vals = values[dfs_idx]
 
-    # Генеруємо градації кольорів від #1296F0 до білих
-    n = len(heap)
+    # Градації кольорів від #1296F0 до білих: колір вузла — за його рангом
+    # в обході, тобто за оберненою перестановкою
     base_color = '#1296F0'
-    bfs_colors = get_color_list(base_color, n)
-    dfs_colors = get_color_list(base_color, n)
-    bfs_color_map = [bfs_colors[bfs_idx.index(i)] for i in G.nodes()]
-    dfs_color_map = [dfs_colors[dfs_idx.index(i)] for i in G.nodes()]
+    bfs_colors = rank_colors(inverse_permutation(bfs_idx), base_color)
+    dfs_colors = rank_colors(inverse_permutation(dfs_idx), base_color)
+    print(f"0) Обходи й кольори для {n} вузлів: {time.perf_counter() - t:.2f} с")
 
     # Файли для збереження
     bfs_img = f"{args.prefix}_bfs.png"
     dfs_img = f"{args.prefix}_dfs.png"
 
-    print("1) Малюємо BFS...") 
-    draw_and_save(G, pos, labels, bfs_color_map, bfs_img)
+    print("1) Малюємо BFS...")
+    draw_and_save(heap, bfs_colors, bfs_img)
     print(f"   BFS-зображення збережено: {bfs_img}")
 
     print("2) Малюємо DFS...")
-    draw_and_save(G, pos, labels, dfs_color_map, dfs_img)
+    draw_and_save(heap, dfs_colors, dfs_img)
     print(f"   DFS-зображення збережено: {dfs_img}")
 
     print("3) Генеруємо README...")
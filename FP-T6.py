@@ -1,4 +1,12 @@
 #!/usr/bin/env python3
+import argparse
+import bisect
+import json
+import os
+import random
+import time
+from collections import OrderedDict
+import numpy as np
 
 # Дані про їжу: вартість (cost) і калорійність (calories)
 ITEMS = {
@@ -10,10 +18,11 @@ ITEMS = {
     "potato":    {"cost": 25, "calories": 350},
 }
 
-def greedy_algorithm(items, budget):
+def greedy_algorithm(items, budget, mode='01'):
     """
     Жадібний алгоритм: вибирає страви за найбільшим співвідношенням calories/cost,
-    поки бюджет не вичерпається.
+    поки бюджет не вичерпається. У режимах 'unbounded' і 'bounded' бере
+    стільки копій страви, скільки дозволяють бюджет і ліміт (див. MODES).
     Повертає (selection_dict, total_cost, total_calories).
     """
     sorted_items = sorted(
@@ -27,10 +36,12 @@ def greedy_algorithm(items, budget):
     for name, data in sorted_items:
         cost = data['cost']
         cal  = data['calories']
-        if total_cost + cost <= budget:
-            selection[name] = selection.get(name, 0) + 1
-            total_cost += cost
-            total_cal  += cal
+        count = min(_item_limit(data, mode, budget, 0, None),
+                    (budget - total_cost) // cost if cost else 1)
+        if count > 0:
+            selection[name] = selection.get(name, 0) + count
+            total_cost += cost * count
+            total_cal  += cal * count
     return selection, total_cost, total_cal
 
 def dynamic_programming(items, budget):
@@ -68,10 +79,709 @@ def dynamic_programming(items, budget):
     total_cost = sum(items[name]['cost']*cnt for name,cnt in selection.items())
     return selection, total_cost, total_cal
 
+# Найбільший розмір бітової матриці вибору (байт), за якого відновлення
+# йде через неї; для більших задач — через рекурсивний перерахунок
+BITSET_LIMIT = 256 * 2**20
+
+
+def _shift(shape, w):
+    """
+    Зрізи (куди, звідки) для зсуву таблиці DP на вектор ваг w, або None,
+    якщо предмет не вміщується в жодну клітинку.
+    """
+    if any(wi >= si for wi, si in zip(w, shape)):
+        return None
+    dst = tuple(slice(wi, None) for wi in w)
+    src = tuple(slice(0, si - wi) for wi, si in zip(w, shape))
+    return dst, src
+
+
+def _dp_row(weights, values, row):
+    """
+    Проганяє таблицю DP row (найкраще значення для кожного вектора
+    обмежень) через предмети: один векторний зсув-і-максимум на предмет.
+    У звичайному випадку row — рядок довжини budget + 1. Змінює row на місці.
+    """
+    for w, v in zip(weights, values):
+        sl = _shift(row.shape, w)
+        if sl is not None:
+            dst, src = sl
+            np.maximum(row[dst], row[src] + v, out=row[dst])
+    return row
+
+
+def _keep_bits(weights, values, shape):
+    """
+    Прямий прохід з однією таблицею DP і упакованою матрицею вибору:
+    біт (i, клітинка) = 1, якщо предмет i покращив її (1 біт на клітинку).
+    """
+    row = np.zeros(shape, dtype=np.int64)
+    size = row.size
+    bits = np.zeros((len(weights), (size + 7) // 8), dtype=np.uint8)
+    take = np.zeros(shape, dtype=bool)
+    for i, (w, v) in enumerate(zip(weights, values)):
+        sl = _shift(shape, w)
+        if sl is None:
+            continue
+        dst, src = sl
+        cand = row[src] + v
+        take[...] = False
+        take[dst] = cand > row[dst]
+        bits[i] = np.packbits(take.ravel())
+        np.maximum(row[dst], cand, out=row[dst])
+    return row, bits
+
+
+def _split_capacity(weights, values, row, target):
+    """
+    Проганяє таблицю через предмети, відстежуючи для кожної клітинки,
+    з якої клітинки вона походить на початку проходу. Повертає клітинку на
+    початку, через яку проходить зворотний хід від target.
+    """
+    row = row[tuple(slice(0, t + 1) for t in target)].copy()
+    origin = np.arange(row.size).reshape(row.shape)
+    for w, v in zip(weights, values):
+        sl = _shift(row.shape, w)
+        if sl is None:
+            continue
+        dst, src = sl
+        cand = row[src] + v
+        take = cand > row[dst]
+        origin[dst] = np.where(take, origin[src], origin[dst])
+        np.maximum(row[dst], cand, out=row[dst])
+    return tuple(int(i) for i in np.unravel_index(origin[target], row.shape))
+
+
+def _hirschberg(weights, values, lo, hi, row, target, chosen):
+    """
+    Відновлення вибору поділом навпіл: row — таблиця DP перед предметом lo,
+    target — клітинка після предмета hi - 1. Таблиця середини рахується
+    заново, а клітинку в середині знаходить _split_capacity. Індекси
+    вибраних предметів додаються в chosen у спадному порядку.
+    """
+    if hi - lo == 1:
+        w, v = weights[lo], values[lo]
+        if all(wi <= ti for wi, ti in zip(w, target)):
+            prev = tuple(ti - wi for wi, ti in zip(w, target))
+            if row[prev] + v > row[target]:
+                chosen.append(lo)
+        return
+    mid = (lo + hi) // 2
+    row = row[tuple(slice(0, t + 1) for t in target)]
+    row_mid = _dp_row(weights[lo:mid], values[lo:mid], row.copy())
+    w_mid = _split_capacity(weights[mid:hi], values[mid:hi], row_mid, target)
+    _hirschberg(weights, values, mid, hi, row_mid, target, chosen)
+    _hirschberg(weights, values, lo, mid, row, w_mid, chosen)
+
+
+def _solve_01(weights, values, capacity, reconstruct='auto'):
+    """
+    0/1 knapsack з векторами ваг weights і межами capacity (кортежі).
+    Повертає (найкраще значення, індекси вибраних предметів за спаданням).
+    """
+    shape = tuple(c + 1 for c in capacity)
+    n = len(weights)
+    size = int(np.prod(shape))
+    if reconstruct == 'auto':
+        reconstruct = 'bits' if n * (size + 7) // 8 <= BITSET_LIMIT else 'hirschberg'
+
+    chosen = []
+    if reconstruct == 'bits':
+        row, bits = _keep_bits(weights, values, shape)
+        cell = list(capacity)
+        for i in range(n - 1, -1, -1):
+            flat = int(np.ravel_multi_index(cell, shape))
+            if (bits[i, flat >> 3] >> (7 - (flat & 7))) & 1:
+                chosen.append(i)
+                cell = [c - w for c, w in zip(cell, weights[i])]
+    elif reconstruct == 'hirschberg':
+        row = _dp_row(weights, values, np.zeros(shape, dtype=np.int64))
+        if n:
+            _hirschberg(weights, values, 0, n, np.zeros(shape, dtype=np.int64),
+                        tuple(capacity), chosen)
+    else:
+        raise ValueError(f"Невідомий спосіб відновлення: {reconstruct}")
+    return int(row[tuple(capacity)]), chosen
+
+
+def dynamic_programming_lean(items, budget, reconstruct='auto'):
+    """
+    Той самий 0/1 knapsack, що й dynamic_programming, але з одним рядком
+    NumPy довжини budget + 1 замість таблиць (n+1)×(budget+1).
+    reconstruct='bits' — відновлення з упакованої бітової матриці
+    (n·budget/8 байт), 'hirschberg' — поділом навпіл з перерахунком
+    (O(budget · log n) пам'яті), 'auto' — бітова матриця до BITSET_LIMIT.
+    Результат (включно з вибором за рівних калорій) збігається з
+    dynamic_programming.
+    """
+    names = list(items.keys())
+    weights = [(items[n]['cost'],) for n in names]
+    cals = [items[n]['calories'] for n in names]
+
+    total_cal, chosen = _solve_01(weights, cals, (budget,), reconstruct)
+    selection = {}
+    for i in chosen:
+        selection[names[i]] = selection.get(names[i], 0) + 1
+    total_cost = sum(items[name]['cost']*cnt for name,cnt in selection.items())
+    return selection, total_cost, total_cal
+
+
+# Режими кількості: кожна страва раз, без обмежень або до items[name]['limit']
+MODES = ('01', 'unbounded', 'bounded')
+
+
+def _item_limit(data, mode, budget, cap_weight, cap):
+    """Найбільша корисна кількість копій страви в заданому режимі."""
+    if mode == '01':
+        limit = 1
+    elif mode == 'bounded':
+        limit = data.get('limit', 1)
+    elif mode == 'unbounded':
+        if data['cost'] == 0 and not cap_weight:
+            raise ValueError("Необмежений режим потребує додатної вартості кожної страви")
+        limit = budget // data['cost'] if data['cost'] else cap // cap_weight
+    else:
+        raise ValueError(f"Невідомий режим: {mode}")
+    # Більше копій, ніж уміщує бюджет (або cap), ніколи не знадобиться
+    if data['cost']:
+        limit = min(limit, budget // data['cost'])
+    if cap is not None and cap_weight:
+        limit = min(limit, cap // cap_weight)
+    return limit
+
+
+def _split_item(idx, data, mode, budget, value='calories', cap=None, cap_key='calories'):
+    """
+    Двійкове розбиття кількості страви idx на 0/1-частини 1, 2, 4, …, залишок:
+    список (вектор ваг, значення, (idx, копій)).
+    """
+    cap_weight = data[cap_key] if cap is not None else 0
+    v = 1 if value == 'count' else data[value]
+    remaining = _item_limit(data, mode, budget, cap_weight, cap)
+    pieces = []
+    k = 1
+    while remaining > 0:
+        take = min(k, remaining)
+        w = (data['cost'] * take,) if cap is None else (data['cost'] * take, cap_weight * take)
+        pieces.append((w, v * take, (idx, take)))
+        remaining -= take
+        k *= 2
+    return pieces
+
+
+def knapsack(items, budget, mode='01', value='calories', cap=None, cap_key='calories',
+             reconstruct='auto'):
+    """
+    Узагальнений вибір страв над схемою ITEMS.
+    mode: '01' — кожна страва не більше разу; 'unbounded' — скільки завгодно;
+    'bounded' — не більше items[name]['limit'] (за замовчуванням 1).
+    value — що максимізувати: ключ страви ('calories', ...) або 'count'
+    (кількість страв). cap — друге обмеження: сума items[name][cap_key] ≤ cap.
+
+    Кількості розкладаються двійковим розбиттям (1, 2, 4, …, залишок) на
+    O(log limit) 0/1-предметів, тож великі ліміти не роздувають стан.
+    Повертає (selection_dict, total_cost, total_value).
+    """
+    if value != 'count' and any(value not in data for data in items.values()):
+        raise ValueError(f"Невідома ціль: {value}")
+    weights, values, owners = [], [], []
+    names = list(items.keys())
+    for idx, name in enumerate(names):
+        for w, v, owner in _split_item(idx, items[name], mode, budget, value, cap, cap_key):
+            weights.append(w)
+            values.append(v)
+            owners.append(owner)
+
+    capacity = (budget,) if cap is None else (budget, cap)
+    total_value, chosen = _solve_01(weights, values, capacity, reconstruct)
+    counts = {}
+    for piece in chosen:
+        idx, take = owners[piece]
+        counts[idx] = counts.get(idx, 0) + take
+    selection = {names[i]: counts[i] for i in sorted(counts)}
+    total_cost = sum(items[name]['cost']*cnt for name,cnt in selection.items())
+    return selection, total_cost, total_value
+
+
+class KnapsackIndex:
+    """
+    Попередньо обчислена таблиця відповідей для одного каталогу страв.
+    Один прохід DP до max_budget дає найкращі калорії для кожного меншого
+    бюджету, а упакована матриця вибору (1 біт на клітинку) — відновлення
+    для будь-якого з них. best(budget) = O(1) на значення + O(n) на
+    відновлення; готові відповіді зберігаються в LRU-кеші на cache_size.
+
+    Для mode='01' best(budget) збігається з dynamic_programming(items, budget).
+    """
+
+    def __init__(self, items, max_budget, mode='01', cache_size=1024):
+        self.items = dict(items)
+        self.max_budget = max_budget
+        self.mode = mode
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._build()
+
+    def _build(self):
+        """Повний перерахунок таблиці для поточного каталогу й max_budget."""
+        self._names = list(self.items)
+        self._costs, self._values, self._owners = [], [], []
+        for idx, name in enumerate(self._names):
+            for w, v, owner in _split_item(idx, self.items[name], self.mode, self.max_budget):
+                self._costs.append(w[0])
+                self._values.append(v)
+                self._owners.append(owner)
+        self._row, bits = _keep_bits([(c,) for c in self._costs], self._values,
+                                     (self.max_budget + 1,))
+        self._bits = list(bits)
+        self._cache.clear()
+
+    def _push_piece(self, cost, value, owner):
+        """Додає 0/1-частину в кінець: рядок DP оновлюється одним зсувом."""
+        row = self._row
+        size = len(row)
+        take = np.zeros(size, dtype=bool)
+        if cost < size:
+            cand = row[:size - cost] + value
+            take[cost:] = cand > row[cost:]
+            np.maximum(row[cost:], cand, out=row[cost:])
+        self._bits.append(np.packbits(take))
+        self._costs.append(cost)
+        self._values.append(value)
+        self._owners.append(owner)
+
+    def add_item(self, name, data):
+        """
+        Додає страву в кінець каталогу інкрементально — без перерахунку
+        попередніх рядків. Заміна наявної страви веде до повного перерахунку.
+        Кеш відповідей скидається.
+        """
+        if name in self.items:
+            self.items[name] = data
+            self._build()
+            return
+        self.items[name] = data
+        self._names.append(name)
+        for w, v, owner in _split_item(len(self._names) - 1, data, self.mode, self.max_budget):
+            self._push_piece(w[0], v, owner)
+        self._cache.clear()
+
+    def values(self, budgets):
+        """Найкращі калорії для масиву бюджетів одним індексуванням."""
+        budgets = np.asarray(budgets)
+        if budgets.size and budgets.min() < 0:
+            raise ValueError("Бюджет має бути невід'ємним")
+        if budgets.size and budgets.max() > self.max_budget:
+            self._grow(int(budgets.max()))
+        return self._row[budgets]
+
+    def _grow(self, budget):
+        # Бюджет поза таблицею: перебудова з запасом, щоб не робити її щоразу
+        self.max_budget = max(budget, 2 * self.max_budget)
+        self._build()
+
+    def best(self, budget):
+        """
+        (selection_dict, total_cost, total_calories) для бюджету budget.
+        selection_dict — копія: зміни в ньому не псують кешовану відповідь.
+        """
+        if budget < 0:
+            raise ValueError("Бюджет має бути невід'ємним")
+        if budget > self.max_budget:
+            self._grow(budget)
+        cached = self._cache.get(budget)
+        if cached is not None:
+            self._cache.move_to_end(budget)
+            selection, total_cost, total_cal = cached
+            return dict(selection), total_cost, total_cal
+
+        counts = {}
+        w = budget
+        for i in range(len(self._bits) - 1, -1, -1):
+            if (self._bits[i][w >> 3] >> (7 - (w & 7))) & 1:
+                idx, take = self._owners[i]
+                counts[idx] = counts.get(idx, 0) + take
+                w -= self._costs[i]
+        selection = {self._names[i]: cnt for i, cnt in counts.items()}
+        total_cost = sum(self.items[name]['cost']*cnt for name,cnt in selection.items())
+        result = (selection, total_cost, int(self._row[budget]))
+
+        self._cache[budget] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return dict(selection), result[1], result[2]
+
+    def best_many(self, budgets):
+        """Відповіді best для кожного бюджету зі списку."""
+        return [self.best(b) for b in budgets]
+
+    def save(self, path):
+        """Зберігає таблицю й каталог у .npz для швидкого старту."""
+        bits = np.stack(self._bits) if self._bits else np.zeros((0, (self.max_budget + 8) // 8),
+                                                                 dtype=np.uint8)
+        meta = json.dumps({'items': self.items, 'max_budget': self.max_budget,
+                           'mode': self.mode, 'names': self._names}, ensure_ascii=False)
+        np.savez(path, row=self._row, bits=bits, costs=np.array(self._costs, dtype=np.int64),
+                 values=np.array(self._values, dtype=np.int64),
+                 owners=np.array(self._owners, dtype=np.int64).reshape(-1, 2),
+                 meta=np.array(meta))
+
+    @classmethod
+    def load(cls, path, cache_size=1024):
+        """Відновлює індекс, збережений save, без перерахунку DP."""
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            index = cls.__new__(cls)
+            index.items = meta['items']
+            index.max_budget = meta['max_budget']
+            index.mode = meta['mode']
+            index.cache_size = cache_size
+            index._cache = OrderedDict()
+            index._names = meta['names']
+            index._row = f['row'].copy()
+            index._bits = list(f['bits'])
+            index._costs = f['costs'].tolist()
+            index._values = f['values'].tolist()
+            index._owners = [tuple(o) for o in f['owners'].tolist()]
+        return index
+
+
+# Найбільша кількість страв, для якої перебір половин ще вміщується в пам'ять
+MITM_LIMIT = 40
+
+# Найбільша кількість клітинок n × (budget + 1), за якої обирається DP
+DP_CELL_LIMIT = 5 * 10**7
+
+
+def _selection(items, names, chosen):
+    """Словник вибору й сумарні вартість і калорії за індексами страв."""
+    selection = {names[i]: 1 for i in sorted(chosen)}
+    total_cost = sum(items[name]['cost'] for name in selection)
+    total_cal = sum(items[name]['calories'] for name in selection)
+    return selection, total_cost, total_cal
+
+
+def _subset_sums(costs, values):
+    """Вартості, калорії та бітові маски всіх 2^k підмножин, подвоєнням масивів."""
+    dtype = np.int64 if all(isinstance(c, int) for c in costs) else np.float64
+    sub_cost = np.zeros(1, dtype=dtype)
+    sub_val = np.zeros(1, dtype=np.float64 if dtype is np.float64 else np.int64)
+    sub_mask = np.zeros(1, dtype=np.int64)
+    for j, (c, v) in enumerate(zip(costs, values)):
+        sub_cost = np.concatenate([sub_cost, sub_cost + c])
+        sub_val = np.concatenate([sub_val, sub_val + v])
+        sub_mask = np.concatenate([sub_mask, sub_mask | (1 << j)])
+    return sub_cost, sub_val, sub_mask
+
+
+def meet_in_the_middle(items, budget):
+    """
+    Точний 0/1 knapsack для n ≤ MITM_LIMIT з довільними (дійсними чи
+    величезними) вартостями: O(2^(n/2) · n) замість O(n · budget).
+    Підмножини другої половини сортуються за вартістю й проріджуються за
+    домінуванням (лишаються лише ті, що строго покращують калорії), після
+    чого кожній підмножині першої половини пара знаходиться searchsorted.
+    """
+    names = list(items.keys())
+    n = len(names)
+    if n > MITM_LIMIT:
+        raise ValueError(f"meet_in_the_middle підтримує до {MITM_LIMIT} страв")
+    costs = [items[k]['cost'] for k in names]
+    cals = [items[k]['calories'] for k in names]
+    half = n // 2
+    a_cost, a_val, a_mask = _subset_sums(costs[:half], cals[:half])
+    b_cost, b_val, b_mask = _subset_sums(costs[half:], cals[half:])
+
+    order = np.lexsort((-b_val, b_cost))
+    b_cost, b_val, b_mask = b_cost[order], b_val[order], b_mask[order]
+    # Домінування: за більшої вартості варто лишати лише строго більші калорії
+    prev_best = np.maximum.accumulate(np.concatenate([[b_val[0] - 1], b_val[:-1]]))
+    keep = b_val > prev_best
+    b_cost, b_val, b_mask = b_cost[keep], b_val[keep], b_mask[keep]
+
+    fits = a_cost <= budget
+    a_cost, a_val, a_mask = a_cost[fits], a_val[fits], a_mask[fits]
+    pair = np.searchsorted(b_cost, budget - a_cost, side='right') - 1
+    total = a_val + b_val[pair]
+    best = int(np.argmax(total))
+    mask_a, mask_b = int(a_mask[best]), int(b_mask[pair[best]])
+    chosen = [j for j in range(half) if mask_a >> j & 1]
+    chosen += [half + j for j in range(n - half) if mask_b >> j & 1]
+    return _selection(items, names, chosen)
+
+
+def branch_and_bound(items, budget):
+    """
+    Точний 0/1 knapsack гілками й межами для великих n і бюджетів.
+    Страви впорядковуються за calories/cost, як у greedy_algorithm;
+    жадібний вибір дає початковий рекорд, а дробова (лінійна) релаксація —
+    верхню межу вузла, що рахується за O(log n) через префіксні суми.
+    Обхід у глибину з явним стеком, спершу гілка «взяти».
+    """
+    names = list(items.keys())
+    order = sorted(range(len(names)), reverse=True,
+                   key=lambda i: (items[names[i]]['calories'] / items[names[i]]['cost']
+                                  if items[names[i]]['cost'] else float('inf')))
+    costs = [items[names[i]]['cost'] for i in order]
+    cals = [items[names[i]]['calories'] for i in order]
+    n = len(order)
+    pre_cost, pre_val = [0], [0]
+    for c, v in zip(costs, cals):
+        pre_cost.append(pre_cost[-1] + c)
+        pre_val.append(pre_val[-1] + v)
+
+    def bound(i, cap, val):
+        # Цілі страви i..k-1 влазять повністю, від k-ї береться частка
+        k = bisect.bisect_right(pre_cost, pre_cost[i] + cap, lo=i) - 1
+        ub = val + pre_val[k] - pre_val[i]
+        if k < n:
+            ub += (cap - (pre_cost[k] - pre_cost[i])) * cals[k] / costs[k]
+        return ub
+
+    # Початковий рекорд — жадібний прохід у тому ж порядку
+    best_val, best_node, cap, node = 0, None, budget, None
+    for i in range(n):
+        if costs[i] <= cap:
+            cap -= costs[i]
+            best_val += cals[i]
+            best_node = node = (i, node)
+
+    stack = [(0, budget, 0, None)]
+    while stack:
+        i, cap, val, node = stack.pop()
+        if val > best_val:
+            best_val, best_node = val, node
+        if i == n or bound(i, cap, val) <= best_val:
+            continue
+        stack.append((i + 1, cap, val, node))
+        if costs[i] <= cap:
+            stack.append((i + 1, cap - costs[i], val + cals[i], (i, node)))
+
+    chosen = []
+    while best_node is not None:
+        chosen.append(order[best_node[0]])
+        best_node = best_node[1]
+    return _selection(items, names, chosen)
+
+
+# Точні розв'язувачі 0/1 knapsack за назвою
+SOLVERS = {
+    'dp': dynamic_programming_lean,
+    'mitm': meet_in_the_middle,
+    'bnb': branch_and_bound,
+}
+
+
+def choose_solver(items, budget):
+    """
+    Назва розв'язувача з SOLVERS: DP лише для цілих вартостей і малого
+    n × budget, інакше перебір половин для n ≤ MITM_LIMIT, інакше гілки й межі.
+    """
+    n = len(items)
+    integral = all(isinstance(d['cost'], int) for d in items.values())
+    if integral and n * (budget + 1) <= DP_CELL_LIMIT:
+        return 'dp'
+    if n <= MITM_LIMIT:
+        return 'mitm'
+    return 'bnb'
+
+
+def solve(items, budget, solver='auto'):
+    """Точний 0/1 knapsack автоматично обраним (або заданим) розв'язувачем."""
+    if solver == 'auto':
+        solver = choose_solver(items, budget)
+    return SOLVERS[solver](items, budget)
+
+
+def instance(kind, n, max_cost, seed=0):
+    """
+    Випадкові класи задач: uncorrelated — незалежні вартість і калорії;
+    weakly — калорії близькі до вартості; strongly — калорії = вартість + const,
+    найважчий клас для гілок і меж (тому на ньому з малим бюджетом
+    choose_solver обирає DP).
+    """
+    rng = random.Random(seed)
+    items = {}
+    for i in range(n):
+        c = rng.randint(1, max_cost)
+        if kind == 'uncorrelated':
+            v = rng.randint(1, max_cost)
+        elif kind == 'weakly':
+            v = max(1, c + rng.randint(-max_cost // 10, max_cost // 10))
+        else:
+            v = c + max_cost // 10
+        items[f"item{i}"] = {"cost": c, "calories": v}
+    return items
+
+
+def benchmark_solvers(seed=0):
+    """Час кожного розв'язувача на класах задач; DP — де таблиця ще влазить."""
+    cases = [
+        ('uncorrelated', 30, 10**4), ('strongly', 30, 10**4),
+        ('uncorrelated', 36, 10**9), ('strongly', 36, 10**9),
+        ('uncorrelated', 1000, 100), ('weakly', 1000, 100),
+        ('uncorrelated', 1000, 10**4), ('weakly', 1000, 10**4),
+        ('uncorrelated', 10**4, 10**9), ('weakly', 200, 10**9),
+    ]
+    print(f"{'клас':<14}{'n':>6}{'max cost':>10}  {'auto':<5}" +
+          "".join(f"{name:>10}" for name in SOLVERS))
+    for kind, n, max_cost in cases:
+        items = instance(kind, n, max_cost, seed)
+        budget = sum(d['cost'] for d in items.values()) // 2
+        cells = []
+        results = set()
+        for name, fn in SOLVERS.items():
+            if name == 'dp' and n * (budget + 1) > 4 * DP_CELL_LIMIT:
+                cells.append(f"{'—':>10}")
+                continue
+            if name == 'mitm' and n > MITM_LIMIT:
+                cells.append(f"{'—':>10}")
+                continue
+            t = time.perf_counter()
+            results.add(fn(items, budget)[2])
+            cells.append(f"{time.perf_counter() - t:>9.3f}с")
+        assert len(results) == 1, "Розв'язувачі дали різні оптимуми"
+        print(f"{kind:<14}{n:>6}{max_cost:>10.0e}  {choose_solver(items, budget):<5}" + "".join(cells))
+
+
+def random_items(n, max_cost=100, max_calories=1000, seed=0):
+    """Випадкове меню з n страв для перевірок і бенчмарків."""
+    rng = random.Random(seed)
+    return {f"item{i}": {"cost": rng.randint(1, max_cost),
+                         "calories": rng.randint(1, max_calories)}
+            for i in range(n)}
+
+
+def benchmark(n=2000, budget=100_000, seed=0):
+    """
+    Порівнює dynamic_programming з dynamic_programming_lean на задачі,
+    яку ще тягне еталон, і показує, як lean масштабується до n × budget.
+    """
+    def run(fn, *args):
+        t = time.perf_counter()
+        res = fn(*args)
+        return res, time.perf_counter() - t
+
+    small = random_items(200, seed=seed)
+    ref, t_ref = run(dynamic_programming, small, 5000)
+    print(f"n = 200, budget = 5000: еталон {t_ref:.2f} с")
+    for mode in ('bits', 'hirschberg'):
+        res, t = run(dynamic_programming_lean, small, 5000, mode)
+        print(f"  lean/{mode:<10} {t:.3f} с, збіг з еталоном: {res == ref}")
+
+    items = random_items(n, seed=seed)
+    print(f"n = {n}, budget = {budget}:")
+    for mode in ('bits', 'hirschberg'):
+        res, t = run(dynamic_programming_lean, items, budget, mode)
+        print(f"  lean/{mode:<10} {t:.2f} с, калорій {res[2]}, вартість {res[1]}")
+
+
+def benchmark_modes(n=10**4, budget=10_000, max_limit=100, seed=0):
+    """
+    Режими knapsack на n стравах: 0/1, необмежений і обмежений (ліміти
+    1..max_limit) за одним бюджетом, а також 0/1 з другим обмеженням на
+    калорії на меншій сітці (бюджет × cap).
+    """
+    rng = random.Random(seed)
+    items = random_items(n, seed=seed)
+    for data in items.values():
+        data['limit'] = rng.randint(1, max_limit)
+    print(f"n = {n}, budget = {budget}")
+    for mode in MODES:
+        t = time.perf_counter()
+        sel, cost, cal = knapsack(items, budget, mode)
+        t = time.perf_counter() - t
+        print(f"  {mode:<10} {t:6.2f} с, страв {sum(sel.values()):>5}, "
+              f"вартість {cost}, калорій {cal}")
+
+    small = random_items(n, max_cost=50, max_calories=50, seed=seed)
+    cap = 200
+    t = time.perf_counter()
+    sel, cost, count = knapsack(small, 200, '01', value='count', cap=cap)
+    t = time.perf_counter() - t
+    cal = sum(small[k]['calories'] * c for k, c in sel.items())
+    print(f"n = {n}, budget = 200, calories <= {cap}, максимум страв:")
+    print(f"  {'01+cap':<10} {t:6.2f} с, страв {count:>5}, вартість {cost}, калорій {cal}")
+
+
 if __name__ == '__main__':
-    BUDGET = 100
+    parser = argparse.ArgumentParser(description="Вибір їжі: жадібний алгоритм і DP")
+    parser.add_argument('--budget', type=int, default=100,
+                        help="Бюджет (за замовчуванням: 100)")
+    parser.add_argument('--mode', choices=MODES, default='01',
+                        help="01 — кожна страва раз, unbounded — без обмежень, "
+                             "bounded — не більше --limit копій (за замовчуванням: 01)")
+    parser.add_argument('--limit', type=int, default=2,
+                        help="Ліміт копій страви в режимі bounded, якщо в ITEMS немає 'limit' "
+                             "(за замовчуванням: 2)")
+    parser.add_argument('--value', default='calories',
+                        choices=sorted({k for data in ITEMS.values() for k in data} - {'limit'})
+                        + ['count'],
+                        help="Що максимізувати: calories, cost або count (за замовчуванням: calories)")
+    parser.add_argument('--cap', type=int,
+                        help="Друге обмеження: сумарні калорії не більше CAP")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Порівняти еталонний DP з рядковим NumPy-DP")
+    parser.add_argument('--benchmark-modes', action='store_true',
+                        help="Бенчмарк режимів 0/1, unbounded, bounded і другого обмеження")
+    parser.add_argument('--budgets', type=int, nargs='+', metavar='B',
+                        help="Відповісти на кілька бюджетів через KnapsackIndex")
+    parser.add_argument('--index', metavar='FILE.npz',
+                        help="Файл індексу для --budgets: завантажити, якщо він відповідає "
+                             "ITEMS і --mode, інакше побудувати й зберегти")
+    parser.add_argument('--solver', choices=('auto',) + tuple(SOLVERS),
+                        help="Розв'язати 0/1 задачу заданим точним розв'язувачем (auto — вибір за розміром)")
+    parser.add_argument('--benchmark-solvers', action='store_true',
+                        help="Порівняти DP, перебір половин і гілки й межі на класах задач")
+    args = parser.parse_args()
+    if args.benchmark_solvers:
+        benchmark_solvers()
+        raise SystemExit
+    if args.solver:
+        name = choose_solver(ITEMS, args.budget) if args.solver == 'auto' else args.solver
+        sel, cost, cal = solve(ITEMS, args.budget, name)
+        print(f"Розв'язувач: {name}")
+        print(f"Вибрано страв: {sel}")
+        print(f"Витрачено коштів: {cost}")
+        print(f"Отримано калорій: {cal}")
+        raise SystemExit
+    if args.budgets:
+        items = {name: {**data, 'limit': data.get('limit', args.limit)}
+                 for name, data in ITEMS.items()}
+        index = None
+        if args.index and os.path.exists(args.index):
+            index = KnapsackIndex.load(args.index)
+            if index.items != items or index.mode != args.mode:
+                index = None
+        if index is None:
+            index = KnapsackIndex(items, max(args.budgets), args.mode)
+            if args.index:
+                index.save(args.index)
+        for b, (sel, cost, cal) in zip(args.budgets, index.best_many(args.budgets)):
+            print(f"Бюджет {b}: {sel}, вартість {cost}, калорій {cal}")
+        raise SystemExit
+    if args.benchmark:
+        benchmark()
+        raise SystemExit
+    if args.benchmark_modes:
+        benchmark_modes()
+        raise SystemExit
+
+    BUDGET = args.budget
     print(f"Приклад: бюджет = {BUDGET}\n")
 
+    if args.mode != '01' or args.value != 'calories' or args.cap is not None:
+        items = {name: {**data, 'limit': data.get('limit', args.limit)}
+                 for name, data in ITEMS.items()}
+        sel, cost, total = knapsack(items, BUDGET, args.mode, args.value, args.cap)
+        cap_note = f", калорії <= {args.cap}" if args.cap is not None else ""
+        print(f"=== Режим {args.mode}: максимум {args.value}{cap_note} ===")
+        print(f"Вибрано страв: {sel}")
+        print(f"Витрачено коштів: {cost}")
+        print(f"Отримано калорій: {sum(ITEMS[k]['calories'] * c for k, c in sel.items())}")
+        print(f"Значення цілі ({args.value}): {total}")
+        raise SystemExit
+
     sel_g, cost_g, cal_g = greedy_algorithm(ITEMS, BUDGET)
     print("=== Жадібний алгоритм ===")
     print(f"Вибрано страв: {sel_g}")
@@ -1,42 +1,234 @@
 #!/usr/bin/env python3
 """
-Завдання 7. Імітація кидків двох кубиків методом Монте-Карло
+Завдання 7. Імітація кидків кубиків методом Монте-Карло
 та порівняння з аналітичними ймовірностями.
+
+За замовчуванням кидаються два шестигранні кубики; --dice та --faces
+задають довільну кількість кубиків з довільною кількістю граней.
 """
 import argparse
+import multiprocessing
 import random
 from collections import Counter
+import numpy as np
 import matplotlib.pyplot as plt
 import os
 
+# Поріг довжини, починаючи з якого згортка виконується через FFT.
+# Пряма згортка зберігає крихітні хвости розподілу (≈ S^-N), FFT — ні,
+# тому FFT вмикається лише для дуже довгих розподілів.
+FFT_THRESHOLD = 4096
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Згортка двох розподілів: пряма для коротких, через FFT для довгих."""
+    if min(len(a), len(b)) < FFT_THRESHOLD:
+        return np.convolve(a, b)
+    n = len(a) + len(b) - 1
+    size = 1 << (n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(a, size) * np.fft.rfft(b, size), size)[:n]
+    # FFT дає шум порядку 1e-17 — відсікаємо від'ємні значення
+    return np.clip(out, 0.0, None)
+
+def analytical_distribution(dice: int = 2, faces: int = 6) -> dict:
+    """
+    Точний розподіл суми dice кубиків з faces гранями.
+    Розподіл одного кубика — поліном (x + x^2 + ... + x^S)/S; його dice-й
+    степінь обчислюється піднесенням до степеня через повторні згортки.
+    """
+    one = np.full(faces, 1.0 / faces)
+    result = np.ones(1)
+    base = one
+    k = dice
+    while k:
+        if k & 1:
+            result = _convolve(result, base)
+        k >>= 1
+        if k:
+            base = _convolve(base, base)
+    # Індекс 0 відповідає мінімальній сумі dice
+    return {dice + i: float(p) for i, p in enumerate(result)}
+
+def support(dice: int = 2, faces: int = 6) -> range:
+    """Діапазон можливих сум: від dice до dice*faces."""
+    return range(dice, dice * faces + 1)
+
 # Аналітичні ймовірності для суми двох шестигранних кубиків
-ANALYTICAL = {
-    2: 1/36,  3: 2/36,  4: 3/36,  5: 4/36,
-    6: 5/36,  7: 6/36,  8: 5/36,  9: 4/36,
-    10:3/36, 11:2/36, 12:1/36
-}
+ANALYTICAL = analytical_distribution(2, 6)
+
+# Розмір блоку кидків. Кожен блок має власний потік випадкових чисел,
+# тому результат залежить лише від seed, а не від кількості процесів.
+CHUNK = 1_000_000
 
-def simulate(trials: int) -> Counter:
-    """Повертає лічильник випадків для сум двох кубиків."""
+# Розмір блоку в режимі --tolerance: збіжність перевіряється після кожного
+# блоку, тож зупинка можлива з точністю до ADAPTIVE_CHUNK кидків
+ADAPTIVE_CHUNK = 10_000
+
+def simulate_python(trials: int, rng: random.Random = random,
+                    dice: int = 2, faces: int = 6) -> Counter:
+    """Еталонна реалізація: чистий Python-цикл з randint."""
     counts = Counter()
     for _ in range(trials):
-        s = random.randint(1,6) + random.randint(1,6)
+        s = sum(rng.randint(1, faces) for _ in range(dice))
         counts[s] += 1
     return counts
 
-def plot_probabilities(sim_probs, analytic_probs, output: str):
+def simulate_numpy(trials: int, rng: np.random.Generator = None,
+                   dice: int = 2, faces: int = 6, chunk: int = CHUNK) -> Counter:
+    """
+    Векторизована імітація: кидає кубики блоками (rows, dice), де rows·dice
+    не перевищує chunk, і підраховує суми рядків через np.bincount.
+    """
+    rng = rng or np.random.default_rng()
+    top = dice * faces
+    hist = np.zeros(top + 1, dtype=np.int64)
+    sum_dtype = np.int16 if top < 2**15 else np.int64
+    face_dtype = np.int16 if faces < 2**15 else np.int64
+    rows = max(1, chunk // dice)
+    done = 0
+    while done < trials:
+        m = min(rows, trials - done)
+        block = rng.integers(1, faces + 1, size=(m, dice), dtype=face_dtype)
+        s = block.sum(axis=1, dtype=sum_dtype)
+        hist += np.bincount(s, minlength=top + 1)
+        done += m
+    return Counter({s: int(hist[s]) for s in support(dice, faces) if hist[s]})
+
+BACKENDS = {
+    'python': simulate_python,
+    'numpy': simulate_numpy,
+}
+
+def _simulate_block(task) -> Counter:
+    """Імітує один блок кидків із власним потоком seed (виконується у воркері)."""
+    backend, size, seed_seq, dice, faces = task
+    if backend == 'python':
+        rng = random.Random(int.from_bytes(seed_seq.generate_state(4).tobytes(), 'little'))
+    else:
+        rng = np.random.default_rng(seed_seq)
+    return BACKENDS[backend](size, rng, dice, faces)
+
+def _blocks(trials: int, backend: str, root: np.random.SeedSequence, chunk: int,
+            dice: int, faces: int):
+    """Розбиває trials на блоки; i-й блок завжди отримує потік spawn_key=(i,)."""
+    for i, start in enumerate(range(0, trials, chunk)):
+        seed_seq = np.random.SeedSequence(root.entropy, spawn_key=(i,))
+        yield backend, min(chunk, trials - start), seed_seq, dice, faces
+
+def _run_blocks(tasks, workers: int):
+    """Лінива послідовність гістограм блоків у порядку їхніх номерів."""
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            yield from pool.imap(_simulate_block, tasks)
+    else:
+        for task in tasks:
+            yield _simulate_block(task)
+
+def simulate(trials: int, backend: str = 'python', seed: int = None,
+             workers: int = 1, chunk: int = CHUNK,
+             dice: int = 2, faces: int = 6) -> Counter:
+    """
+    Повертає лічильник випадків для сум dice кубиків з faces гранями.
+    Кидки діляться на блоки по chunk; при workers > 1 блоки розподіляються
+    по пулу процесів, а їхні гістограми сумуються. При однаковому seed
+    результат побітово однаковий за будь-якої кількості процесів.
+    """
+    root = np.random.SeedSequence(seed)
+    tasks = _blocks(trials, backend, root, chunk, dice, faces)
+    counts = Counter()
+    for part in _run_blocks(tasks, workers):
+        counts.update(part)
+    return counts
+
+# z-квантиль нормального розподілу для 95% довірчого інтервалу
+Z_95 = 1.959963984540054
+
+def simulate_adaptive(tolerance: float, max_trials: int, analytic_probs: dict,
+                      backend: str = 'python', seed: int = None, workers: int = 1,
+                      chunk: int = ADAPTIVE_CHUNK, dice: int = 2, faces: int = 6,
+                      z: float = Z_95):
+    """
+    Імітація з адаптивною зупинкою: кидки виконуються блоками по chunk, і після
+    кожного блоку для всіх сум обчислюється півширина довірчого інтервалу
+    z·sqrt(p(1-p)/n). Щойно вона менша за tolerance для кожної суми,
+    імітація зупиняється; max_trials — верхня межа бюджету.
+
+    Для оцінки p використовується (k+1)/(n+2), щоб суми, які ще жодного разу
+    не випали, не вважалися збіжними з нульовою похибкою.
+
+    Повертає (counts, trials_used, history), де history — список словників
+    з ключами trials, ci (макс. півширина), max_dev (макс. |p̂ - p|) та chi2.
+    """
+    sums = np.array(list(support(dice, faces)))
+    expected = np.array([analytic_probs[s] for s in sums])
+    hist = np.zeros(len(sums), dtype=np.int64)
+    counts = Counter()
+    history = []
+    n = 0
+
+    root = np.random.SeedSequence(seed)
+    tasks = _blocks(max_trials, backend, root, chunk, dice, faces)
+    blocks = _run_blocks(tasks, workers)
+    try:
+        for part in blocks:
+            counts.update(part)
+            for s, k in part.items():
+                hist[s - dice] += k
+            n += sum(part.values())
+
+            p_hat = hist / n
+            p_safe = (hist + 1) / (n + 2)
+            ci = z * np.sqrt(p_safe * (1 - p_safe) / n)
+            nz = expected > 0
+            chi2 = float(np.sum((hist[nz] - n * expected[nz]) ** 2 / (n * expected[nz])))
+            history.append({
+                'trials': n,
+                'ci': float(ci.max()),
+                'max_dev': float(np.abs(p_hat - expected).max()),
+                'chi2': chi2,
+            })
+            if ci.max() < tolerance:
+                break
+    finally:
+        blocks.close()
+    return counts, n, history
+
+def parse_trials(value: str) -> int:
+    """Розбирає кількість симуляцій: 1000000, 1_000_000 або 1e9."""
+    try:
+        n = int(value)
+    except ValueError:
+        f = float(value)
+        if not f.is_integer():
+            raise argparse.ArgumentTypeError(f"не ціле число: {value}")
+        n = int(f)
+    if n <= 0:
+        raise argparse.ArgumentTypeError("кількість симуляцій має бути додатною")
+    return n
+
+def _dice_title(dice: int, faces: int) -> str:
+    """Підпис для графіка та README: «двох кубиків» або «10 кубиків d20»."""
+    if (dice, faces) == (2, 6):
+        return 'двох кубиків'
+    return f'{dice} кубиків d{faces}'
+
+def plot_probabilities(sim_probs, analytic_probs, output: str,
+                       dice: int = 2, faces: int = 6, trials: int = None):
     """Будує та зберігає графік порівняння імовірностей."""
-    sums = list(range(2,13))
+    sums = list(support(dice, faces))
     mc = [sim_probs[s] for s in sums]
     an = [analytic_probs[s] for s in sums]
 
     plt.figure(figsize=(8,5))
-    plt.bar(sums, mc, width=0.6, label='Monte Carlo', alpha=0.7)
+    plt.bar(sums, mc, width=0.6 if len(sums) <= 30 else 0.9, label='Monte Carlo', alpha=0.7)
     plt.plot(sums, an, 'r-o', label='Аналітична', linewidth=2)
     plt.xlabel('Сума на кубиках')
     plt.ylabel('Ймовірність')
-    plt.title('Ймовірності сум при киданні двох кубиків')
-    plt.xticks(sums)
+    title = f'Ймовірності сум при киданні {_dice_title(dice, faces)}'
+    if trials is not None:
+        title += f' (n = {trials:,})'
+    plt.title(title)
+    if len(sums) <= 30:
+        plt.xticks(sums)
     plt.legend()
     plt.grid(axis='y', alpha=0.3)
     plt.tight_layout()
@@ -46,23 +238,58 @@ def plot_probabilities(sim_probs, analytic_probs, output: str):
     plt.close()
     print(f"Plot saved to {output}")
 
-def generate_readme(sim_probs, analytic_probs, trials, plot_file, path='README.md'):
+def plot_convergence(history, tolerance: float, output: str):
+    """Будує криву збіжності: похибки в залежності від кількості кидків."""
+    trials = [h['trials'] for h in history]
+    plt.figure(figsize=(8,5))
+    plt.loglog(trials, [h['ci'] for h in history], 'b-o', markersize=3,
+               label='Макс. півширина довірчого інтервалу')
+    plt.loglog(trials, [h['max_dev'] for h in history], 'g-o', markersize=3,
+               label='Макс. |MC - аналітична|')
+    plt.axhline(tolerance, color='r', linestyle='--', label=f'Допуск {tolerance:g}')
+    plt.xlabel('Кількість симуляцій')
+    plt.ylabel('Похибка')
+    plt.title(f'Збіжність Монте-Карло (зупинка на n = {trials[-1]:,})')
+    plt.legend()
+    plt.grid(which='both', alpha=0.3)
+    plt.tight_layout()
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    plt.savefig(output, dpi=300)
+    plt.close()
+    print(f"Convergence plot saved to {output}")
+
+def generate_readme(sim_probs, analytic_probs, trials, plot_file, path='README.md',
+                    dice: int = 2, faces: int = 6, tolerance: float = None,
+                    history=None, convergence_file: str = None):
     """Генерує README.md з таблицею та висновками."""
+    mode = max(analytic_probs, key=analytic_probs.get)
     lines = []
-    lines.append('# Завдання 7. Імітація кидків двох кубиків методом Монте-Карло')
-    lines.append(f'- Кількість симуляцій: **{trials:,}**\n')
+    lines.append(f'# Завдання 7. Імітація кидків {_dice_title(dice, faces)} методом Монте-Карло')
+    if tolerance is None:
+        lines.append(f'- Кількість симуляцій: **{trials:,}**\n')
+    else:
+        last = history[-1]
+        lines.append(f'- Кількість симуляцій: **{trials:,}** (адаптивна зупинка)')
+        lines.append(f'- Допуск (півширина 95% довірчого інтервалу): **{tolerance:g}**')
+        lines.append(f'- Досягнута півширина інтервалу: **{last["ci"]:.3g}**')
+        lines.append(f'- Макс. відхилення від аналітичних: **{last["max_dev"]:.3g}**, '
+                     f'χ² = **{last["chi2"]:.2f}**\n')
     lines.append('| Сума | MC імовірність | Аналітична імовірність |')
     lines.append('|:----:|:--------------:|:----------------------:|')
-    for s in range(2, 13):
+    for s in support(dice, faces):
         p_mc = sim_probs[s]
         p_an = analytic_probs[s]
         lines.append(f'|  {s}  |    {p_mc:.4%}    |       {p_an:.4%}       |')
     lines.append('\n## Графік\n')
     lines.append(f'![]({plot_file})\n')
+    if convergence_file:
+        lines.append('## Збіжність\n')
+        lines.append(f'![]({convergence_file})\n')
     lines.append('## Висновки')
     lines.append('- Імітація методом Монте-Карло добре апроксимує аналітичні ймовірності.')
     lines.append('- Похибка зменшується зі збільшенням кількості симуляцій.')
-    lines.append('- Для найчастішої суми (7) симульована ймовірність найближча до теоретичної.\n')
+    lines.append(f'- Для найчастішої суми ({mode}) симульована ймовірність найближча до теоретичної.\n')
 
     with open(path, 'w', encoding='utf-8') as f:
         f.write('\n'.join(lines))
@@ -70,26 +297,69 @@ def generate_readme(sim_probs, analytic_probs, trials, plot_file, path='README.m
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Завдання 7: кидки двох кубиків Monte Carlo"
+        description="Завдання 7: кидки кубиків Monte Carlo"
     )
-    parser.add_argument('--trials', '-n', type=int, default=1_000_000,
-                        help='Кількість симуляцій (за замовчуванням: 1_000_000)')
+    parser.add_argument('--trials', '-n', type=parse_trials, default=1_000_000,
+                        help='Кількість симуляцій, напр. 1_000_000 або 1e9 (за замовчуванням: 1_000_000)')
+    parser.add_argument('--backend', '-b', choices=sorted(BACKENDS), default='python',
+                        help='Рушій імітації: python (еталон) або numpy (за замовчуванням: python)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Кількість процесів (за замовчуванням: 1)')
+    parser.add_argument('--seed', '-s', type=int, default=None,
+                        help='Seed для відтворюваності (за замовчуванням: випадковий)')
+    parser.add_argument('--dice', '-d', type=int, default=2,
+                        help='Кількість кубиків (за замовчуванням: 2)')
+    parser.add_argument('--faces', '-f', type=int, default=6,
+                        help='Кількість граней кубика (за замовчуванням: 6)')
+    parser.add_argument('--tolerance', '-t', type=float, default=None,
+                        help='Адаптивна зупинка: півширина 95%% довірчого інтервалу для кожної суми; '
+                             '--trials стає верхньою межею')
+    parser.add_argument('--batch', type=parse_trials, default=None,
+                        help=f'Розмір блоку кидків; з --tolerance збіжність перевіряється '
+                             f'після кожного блоку, тож зупинка відбувається з точністю до '
+                             f'--batch кидків (за замовчуванням: {CHUNK:_}, '
+                             f'з --tolerance: {ADAPTIVE_CHUNK:_})')
     parser.add_argument('--plot', '-p', default='dice_probs.png',
                         help='Файл для збереження графіка (PNG)')
     parser.add_argument('--readme', '-r', default='README.md',
                         help='Шлях до README (Markdown)')
     args = parser.parse_args()
 
+    if args.dice < 1 or args.faces < 1:
+        parser.error('--dice та --faces мають бути додатними')
+
+    # Аналітичний розподіл для заданої конфігурації
+    analytical = analytical_distribution(args.dice, args.faces)
+
     # Імітація
-    counts = simulate(args.trials)
+    history = None
+    convergence_file = None
+    if args.batch is None:
+        args.batch = CHUNK if args.tolerance is None else ADAPTIVE_CHUNK
+    if args.tolerance is None:
+        trials = args.trials
+        counts = simulate(trials, args.backend, seed=args.seed, workers=args.workers,
+                          chunk=args.batch, dice=args.dice, faces=args.faces)
+    else:
+        counts, trials, history = simulate_adaptive(
+            args.tolerance, args.trials, analytical, args.backend, seed=args.seed,
+            workers=args.workers, chunk=args.batch, dice=args.dice, faces=args.faces)
+        print(f"Stopped after {trials:,} trials (CI half-width {history[-1]['ci']:.3g})")
     # Переводимо лічильники у ймовірності
-    sim_probs = {s: counts[s]/args.trials for s in range(2,13)}
+    sim_probs = {s: counts[s]/trials for s in support(args.dice, args.faces)}
 
     # Побудова графіка
-    plot_probabilities(sim_probs, ANALYTICAL, args.plot)
+    plot_probabilities(sim_probs, analytical, args.plot, args.dice, args.faces,
+                       trials=trials if history else None)
+    if history:
+        root, ext = os.path.splitext(args.plot)
+        convergence_file = f'{root}_convergence{ext or ".png"}'
+        plot_convergence(history, args.tolerance, convergence_file)
 
     # Генерація README
-    generate_readme(sim_probs, ANALYTICAL, args.trials, args.plot, path=args.readme)
+    generate_readme(sim_probs, analytical, trials, args.plot, path=args.readme,
+                    dice=args.dice, faces=args.faces, tolerance=args.tolerance,
+                    history=history, convergence_file=convergence_file)
 
 if __name__ == '__main__':
     main()